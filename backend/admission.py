@@ -0,0 +1,225 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from .config import (
+    BULK_WEIGHT, INTERACTIVE_WEIGHT, LLM_CONCURRENCY, OCR_CONCURRENCY, RATE_LIMIT_BURST, RATE_LIMIT_PER_MINUTE,
+    STAGE_MAX_WAITING, STAGE_WAIT_TIMEOUT, STARVATION_SECONDS, SUBMIT_CONCURRENCY, TRUSTED_PROXY_HOPS,
+)
+from .metrics import ADMISSION_REJECTIONS, ADMISSION_WAIT, QUEUE_DEPTH, STAGE_IN_FLIGHT
+
+# Workload classes. API requests are interactive unless sent with
+# "X-Workload: bulk"; background jobs and outbox retries are bulk
+INTERACTIVE, BULK = "interactive", "bulk"
+WORKLOAD_WEIGHTS = {INTERACTIVE: INTERACTIVE_WEIGHT, BULK: BULK_WEIGHT}
+workload_class = ContextVar("workload_class", default=INTERACTIVE)
+
+
+class Overloaded(Exception):
+    """A stage's wait queue is full, or the wait for a slot timed out; served as 503"""
+    def __init__(self, stage: str, retry_after: int):
+        super().__init__(f"Server busy ({stage}); retry in {retry_after}s")
+        self.stage = stage
+        self.retry_after = retry_after
+
+
+def client_key(forwarded_for: str, peer: str) -> str:
+    """Client address for rate limiting.
+
+    Behind TRUSTED_PROXY_HOPS proxies the client is that many entries from the
+    right of X-Forwarded-For; entries further left are client-supplied.
+    """
+    if TRUSTED_PROXY_HOPS:
+        hops = [h.strip() for h in forwarded_for.split(",") if h.strip()]
+        if len(hops) >= TRUSTED_PROXY_HOPS:
+            return hops[-TRUSTED_PROXY_HOPS]
+    return peer or "unknown"
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token; returns 0, or the seconds until one is available"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class ClientRateLimiter:
+    """A token bucket per client, used from the event loop only"""
+
+    # Past this many clients, buckets that have refilled completely are dropped
+    MAX_BUCKETS = 10000
+
+    def __init__(self, per_minute: float = RATE_LIMIT_PER_MINUTE, burst: int = RATE_LIMIT_BURST):
+        self.rate = per_minute / 60
+        self.burst = max(1, burst)
+        self.buckets = {}
+
+    def check(self, client: str) -> float:
+        """0 if the request is admitted, else the seconds to wait (Retry-After)"""
+        if self.rate <= 0:
+            return 0.0
+        bucket = self.buckets.get(client)
+        if bucket is None:
+            if len(self.buckets) >= self.MAX_BUCKETS:
+                self._prune()
+            bucket = self.buckets[client] = TokenBucket(self.rate, self.burst)
+        return bucket.take()
+
+    def _prune(self):
+        idle_after = time.monotonic() - self.burst / self.rate
+        self.buckets = {k: b for k, b in self.buckets.items() if b.updated > idle_after}
+
+
+class _Waiter:
+    __slots__ = ("workload", "queued_at", "signal")
+
+    def __init__(self, workload: str, queued_at: float, signal):
+        self.workload = workload
+        self.queued_at = queued_at
+        self.signal = signal
+
+
+class FairQueue:
+    """Waiters for a stage, grouped by workload class.
+
+    pop() shares slots between classes in proportion to WORKLOAD_WEIGHTS
+    (stride scheduling: the class with the lowest pass goes next and its pass
+    advances by 1/weight), except that a waiter queued for STARVATION_SECONDS
+    or more goes first, so bulk work still moves while interactive traffic is
+    heavy.
+    """
+
+    def __init__(self):
+        self.queues = {name: deque() for name in WORKLOAD_WEIGHTS}
+        self.passes = dict.fromkeys(WORKLOAD_WEIGHTS, 0.0)
+        self.vtime = 0.0
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+
+    def count(self, workload: str) -> int:
+        return len(self.queues[workload])
+
+    def push(self, waiter: _Waiter):
+        queue = self.queues[waiter.workload]
+        if not queue:
+            # A class doesn't bank credit while it has nothing queued
+            self.passes[waiter.workload] = max(self.passes[waiter.workload], self.vtime)
+        queue.append(waiter)
+
+    def remove(self, waiter: _Waiter):
+        self.queues[waiter.workload].remove(waiter)
+
+    def pop(self) -> _Waiter:
+        heads = [queue[0] for queue in self.queues.values() if queue]
+        if not heads:
+            return None
+        oldest = min(heads, key=lambda w: w.queued_at)
+        if time.monotonic() - oldest.queued_at >= STARVATION_SECONDS:
+            workload = oldest.workload
+        else:
+            workload = min(heads, key=lambda w: self.passes[w.workload]).workload
+        self.vtime = self.passes[workload]
+        self.passes[workload] += 1 / WORKLOAD_WEIGHTS[workload]
+        return self.queues[workload].popleft()
+
+
+class AsyncStageLimit:
+    """At most `limit` concurrent holders of a stage, waited for on the event loop.
+
+    Stages that run in worker threads take their slot here before being
+    dispatched, so queued callers never hold an executor thread. Up to
+    `max_waiting` callers per workload class queue for a slot for at most
+    `timeout` seconds; beyond that Overloaded is raised at once. Freed slots
+    go to waiters by weighted fair share between classes (FairQueue). A limit
+    of 0 disables the cap.
+    """
+
+    def __init__(self, stage: str, limit: int, max_waiting: int = STAGE_MAX_WAITING, timeout: float = STAGE_WAIT_TIMEOUT):
+        self.stage = stage
+        self.limit = limit
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self.active = 0
+        self.queue = FairQueue()
+        # Moving average of how long a slot is held, for Retry-After
+        self.avg_hold = 1.0
+        STAGE_IN_FLIGHT.set_function(lambda: self.active, stage)
+        QUEUE_DEPTH.set_function(self.queue.__len__, f"{stage}_admission")
+
+    def _reject(self, workload: str):
+        ADMISSION_REJECTIONS.inc(self.stage, workload)
+        retry_after = max(1, math.ceil(self.avg_hold * (len(self.queue) + 1) / self.limit))
+        raise Overloaded(self.stage, retry_after)
+
+    def _admitted(self, workload: str, queued_at: float):
+        ADMISSION_WAIT.observe(time.monotonic() - queued_at, self.stage, workload)
+
+    def _held(self, seconds: float):
+        self.avg_hold += (seconds - self.avg_hold) * 0.1
+
+    def _release(self):
+        # Hand the slot straight to the next waiter, or free it
+        waiter = self.queue.pop()
+        if waiter is None:
+            self.active -= 1
+        else:
+            waiter.signal.set_result(None)
+
+    @asynccontextmanager
+    async def hold(self):
+        if self.limit <= 0:
+            yield
+            return
+        workload = workload_class.get()
+        queued_at = time.monotonic()
+        if self.active < self.limit and not self.queue:
+            self.active += 1
+        else:
+            if self.queue.count(workload) >= self.max_waiting:
+                self._reject(workload)
+            waiter = _Waiter(workload, queued_at, asyncio.get_running_loop().create_future())
+            self.queue.push(waiter)
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter.signal), self.timeout)
+            except asyncio.TimeoutError:
+                self._abandon(waiter)
+                self._reject(workload)
+            except asyncio.CancelledError:
+                self._abandon(waiter)
+                raise
+        self._admitted(workload, queued_at)
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._held(time.monotonic() - started)
+            self._release()
+
+    def _abandon(self, waiter: _Waiter):
+        if waiter.signal.done():
+            # The slot was handed over just as the wait ended; pass it on
+            self._release()
+        else:
+            waiter.signal.cancel()
+            self.queue.remove(waiter)
+
+
+# Caps on the expensive stages, shared by every request in the process
+OCR_LIMIT = AsyncStageLimit("ocr", OCR_CONCURRENCY)
+LLM_LIMIT = AsyncStageLimit("llm", LLM_CONCURRENCY)
+SUBMIT_LIMIT = AsyncStageLimit("submit", SUBMIT_CONCURRENCY)
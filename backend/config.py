@@ -1,3 +1,5 @@
+import os
+
 # Free GenAI Models Configuration (Working models only)
 FREE_MODELS = {
     "primary": "mistralai/mistral-7b-instruct:free",
@@ -6,12 +8,136 @@ FREE_MODELS = {
     "backup": "meta-llama/llama-3.2-3b-instruct:free"
 }
 
-# OpenRouter API Configuration
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1/chat/completions"
+# OpenRouter API Configuration; OPENROUTER_API_BASE can point the LLM clients
+# at a compatible stand-in (see benchmarks/mock_openrouter.py)
+OPENROUTER_API_BASE = os.getenv("OPENROUTER_API_BASE", "https://openrouter.ai/api/v1")
+OPENROUTER_BASE_URL = f"{OPENROUTER_API_BASE}/chat/completions"
 REQUIRED_HEADERS = {
     "HTTP-Referer": "https://localhost:8000",
     "X-Title": "Auto Form Filling Agent"
 }
 
 # Llama Cloud Configuration
-LLAMA_CLOUD_BASE_URL = "https://api.cloud.llamaindex.ai/api/parsing/upload"
\ No newline at end of file
+LLAMA_CLOUD_BASE_URL = "https://api.cloud.llamaindex.ai/api/parsing/upload"
+
+# ATS pre-check: number of leading PDF pages inspected
+ATS_CHECK_MAX_PAGES = int(os.getenv("ATS_CHECK_MAX_PAGES", "3"))
+
+# Resume extraction policy: "quality" tries LlamaParse before local extraction,
+# "fastest" races both and keeps the first valid result
+EXTRACTION_POLICIES = ("quality", "fastest")
+EXTRACTION_POLICY = os.getenv("EXTRACTION_POLICY", "quality")
+
+# Upload limits: larger files are rejected, files above the memory threshold
+# are read through an mmap of the spooled temp file instead of into memory
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_MEMORY_BYTES = int(os.getenv("UPLOAD_MEMORY_BYTES", str(1024 * 1024)))
+
+# PDF text extraction budget; pages beyond these limits are never read
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "10"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "50000"))
+
+# Logging: JSON lines written by a background thread to a size-rotated file.
+# Payload strings are truncated, and above the sampling threshold (records per
+# second) only 1 in LOG_SAMPLE_RATE request/response records is kept
+LOG_FILE = os.getenv("LOG_FILE", "app.log")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "3"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_MAX_FIELD_CHARS = int(os.getenv("LOG_MAX_FIELD_CHARS", "500"))
+LOG_MAX_ERROR_CHARS = int(os.getenv("LOG_MAX_ERROR_CHARS", "8000"))
+LOG_SAMPLE_THRESHOLD = int(os.getenv("LOG_SAMPLE_THRESHOLD", "50"))
+LOG_SAMPLE_RATE = int(os.getenv("LOG_SAMPLE_RATE", "10"))
+
+# Tracing: finished request traces are appended as OTLP/JSON lines to this
+# file when it is set (empty disables export)
+TRACE_EXPORT_FILE = os.getenv("TRACE_EXPORT_FILE", "")
+TRACE_EXPORT_QUEUE_SIZE = int(os.getenv("TRACE_EXPORT_QUEUE_SIZE", "1000"))
+
+# Threads behind asyncio.to_thread (PDF/DOCX extraction, OCR)
+WORKER_THREADS = int(os.getenv("WORKER_THREADS", str(min(32, (os.cpu_count() or 1) + 4))))
+
+# Profiling: requests sent with "X-Profile: <ADMIN_TOKEN>", plus a random
+# PROFILE_SAMPLE_RATE fraction of all requests, are profiled with cProfile and
+# tracemalloc and written to PROFILE_DIR. ADMIN_TOKEN also guards /api/admin/*
+# (admin endpoints are disabled while it is empty)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_TOP_FUNCTIONS = int(os.getenv("PROFILE_TOP_FUNCTIONS", "30"))
+
+# Background fill-form jobs: stored in a sqlite database so they survive
+# restarts. A running job's lease is renewed every JOB_LEASE_SECONDS / 3; one
+# whose lease lapses (its process crashed) is retried, up to JOB_MAX_ATTEMPTS
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "jobs.db")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "600"))
+# Time budget for one job run; jobs aren't bound by the frontend's timeout,
+# and the renewed lease keeps a long run from being claimed twice
+JOB_DEADLINE_SECONDS = float(os.getenv("JOB_DEADLINE_SECONDS", "300"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", "10"))
+WEBHOOK_RETRIES = int(os.getenv("WEBHOOK_RETRIES", "3"))
+# Webhooks only go to hosts that resolve to public addresses (never private,
+# loopback or link-local ones). A comma-separated WEBHOOK_ALLOWED_HOSTS also
+# restricts them to those host names
+WEBHOOK_ALLOWED_HOSTS = {h.strip().lower() for h in os.getenv("WEBHOOK_ALLOWED_HOSTS", "").split(",") if h.strip()}
+
+# Form submissions go through a sqlite outbox keyed by form ID + profile hash:
+# resubmitting the same resume to the same form within OUTBOX_RETENTION_SECONDS
+# returns the earlier submission instead of posting again. Timeouts, 429s and
+# 5xx are retried with exponential backoff and jitter up to OUTBOX_MAX_ATTEMPTS;
+# requests wait up to OUTBOX_WAIT_SECONDS for the outcome. The worker keeps up
+# to OUTBOX_BATCH_SIZE submissions in flight (each waiting for a submit slot)
+OUTBOX_DB_PATH = os.getenv("OUTBOX_DB_PATH", "outbox.db")
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "6"))
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE", "2"))
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX", "300"))
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "120"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "1"))
+OUTBOX_WAIT_SECONDS = float(os.getenv("OUTBOX_WAIT_SECONDS", "30"))
+OUTBOX_RETENTION_SECONDS = int(os.getenv("OUTBOX_RETENTION_SECONDS", str(30 * 24 * 3600)))
+
+# Admission control. Each client (by address; set TRUSTED_PROXY_HOPS to the
+# number of proxies in front of the app to read it from X-Forwarded-For) gets
+# RATE_LIMIT_PER_MINUTE requests to the expensive endpoints with bursts of
+# RATE_LIMIT_BURST, answered with 429 beyond that. OCR, LLM calls and form
+# submissions are capped per process; up to STAGE_MAX_WAITING requests wait
+# STAGE_WAIT_TIMEOUT seconds for a slot before getting 503. 0 disables a limit
+RATE_LIMIT_PER_MINUTE = float(os.getenv("RATE_LIMIT_PER_MINUTE", "30"))
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", "10"))
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+OCR_CONCURRENCY = int(os.getenv("OCR_CONCURRENCY", str(os.cpu_count() or 1)))
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+SUBMIT_CONCURRENCY = int(os.getenv("SUBMIT_CONCURRENCY", "16"))
+STAGE_MAX_WAITING = int(os.getenv("STAGE_MAX_WAITING", "32"))
+STAGE_WAIT_TIMEOUT = float(os.getenv("STAGE_WAIT_TIMEOUT", "20"))
+
+# Workload classes at the capped stages: interactive API requests and bulk work
+# (background jobs, outbox retries, requests sent with "X-Workload: bulk").
+# Freed slots go to waiting classes in proportion to their weights, but a
+# waiter queued for STARVATION_SECONDS goes first (keep it under
+# STAGE_WAIT_TIMEOUT so bulk work is delayed rather than rejected)
+INTERACTIVE_WEIGHT = int(os.getenv("INTERACTIVE_WEIGHT", "4"))
+BULK_WEIGHT = int(os.getenv("BULK_WEIGHT", "1"))
+STARVATION_SECONDS = float(os.getenv("STARVATION_SECONDS", "10"))
+
+# Request deadlines: each API request gets REQUEST_DEADLINE_SECONDS (kept under
+# the frontend's 60 s timeout). Optional stages only start with enough budget
+# left (LLAMAPARSE_MIN_SECONDS, LLM_MIN_SECONDS) and time out early enough to
+# leave DEADLINE_RESERVE_SECONDS for the local fallback and the form submission
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "55"))
+DEADLINE_RESERVE_SECONDS = float(os.getenv("DEADLINE_RESERVE_SECONDS", "5"))
+LLAMAPARSE_MIN_SECONDS = float(os.getenv("LLAMAPARSE_MIN_SECONDS", "15"))
+LLM_MIN_SECONDS = float(os.getenv("LLM_MIN_SECONDS", "3"))
+
+# Startup warm-up, run in the background while /api/health already answers:
+# builds the shared LLM and LlamaParse clients, opens a pooled connection to
+# WARMUP_FORMS_URL (empty to skip) and runs tesseract once. /api/ready reports
+# 503 until it finishes or WARMUP_TIMEOUT passes. WARMUP=0 skips it entirely
+WARMUP = os.getenv("WARMUP", "1") != "0"
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "30"))
+WARMUP_FORMS_URL = os.getenv("WARMUP_FORMS_URL", "https://docs.google.com/forms/")
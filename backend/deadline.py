@@ -0,0 +1,67 @@
+import asyncio
+import math
+import time
+
+
+class DeadlineExceeded(Exception):
+    """The request ran out of time, or was cancelled by a client disconnect, during `stage`"""
+    def __init__(self, stage: str, cancelled: bool = False):
+        super().__init__(f"Request {'cancelled' if cancelled else 'deadline exceeded'} during {stage}")
+        self.stage = stage
+        self.cancelled = cancelled
+
+
+class Deadline:
+    """Time budget for one request, passed down through the pipeline stages.
+
+    Stages check `remaining()` to pick a cheaper path when time is short, and
+    run optional work with `run(..., reserve=...)` so that a timeout still
+    leaves time for the fallback. `cancel()` (client disconnect) makes every
+    later check fail, which also stops stages running in worker threads at
+    their next check. Deadline() with no budget never expires.
+    """
+
+    def __init__(self, seconds: float = None):
+        self.expires_at = time.monotonic() + seconds if seconds else None
+        self.cancelled = False
+        self.parent = None
+
+    def child(self) -> "Deadline":
+        """Same budget, but can also be cancelled on its own (e.g. the loser of a race)"""
+        child = Deadline()
+        child.expires_at = self.expires_at
+        child.parent = self
+        return child
+
+    def cancel(self):
+        self.cancelled = True
+
+    def remaining(self) -> float:
+        if self.cancelled or (self.parent is not None and self.parent.remaining() <= 0):
+            return 0.0
+        if self.expires_at is None:
+            return math.inf
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def has(self, seconds: float) -> bool:
+        return self.remaining() >= seconds
+
+    def check(self, stage: str):
+        if self.remaining() <= 0:
+            raise DeadlineExceeded(stage, self.cancelled)
+
+    def timeout(self, cap: float) -> float:
+        """Timeout for a blocking call: `cap`, or less if the budget is nearly spent"""
+        return min(cap, self.remaining())
+
+    async def run(self, awaitable, stage: str, reserve: float = 0.0):
+        """Await within the remaining budget less `reserve` seconds; DeadlineExceeded on timeout"""
+        budget = self.remaining() - reserve
+        if budget <= 0:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise DeadlineExceeded(stage, self.cancelled)
+        try:
+            return await asyncio.wait_for(awaitable, None if budget == math.inf else budget)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(stage, self.cancelled) from None
@@ -0,0 +1,314 @@
+import asyncio
+import ipaddress
+import json
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+import httpx
+from .config import (
+    JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS, JOB_POLL_SECONDS, JOB_RETENTION_SECONDS, JOB_WORKERS, JOBS_DB_PATH,
+    WEBHOOK_ALLOWED_HOSTS, WEBHOOK_RETRIES, WEBHOOK_TIMEOUT,
+)
+from .admission import BULK, Overloaded, workload_class
+from .logger import logger, log_error
+from .metrics import JOB_RUN_LATENCY, JOB_WAIT_LATENCY, JOBS_FINISHED, record_outbound
+from .tracing import start_trace, export_trace
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    content BLOB,
+    webhook_url TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    webhook_status TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+
+def check_webhook_url(url: str):
+    """Raise ValueError unless `url` is an http(s) URL whose host resolves only to public addresses.
+
+    Blocking (resolves the host); checked when a job is submitted and again
+    before each delivery.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("webhook_url must be an http(s) URL")
+    host = parts.hostname.lower()
+    if WEBHOOK_ALLOWED_HOSTS and host not in WEBHOOK_ALLOWED_HOSTS:
+        raise ValueError(f"webhook host {host} is not allowed")
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, parts.port, type=socket.SOCK_STREAM)}
+    except (socket.gaierror, UnicodeError, ValueError) as e:
+        raise ValueError(f"webhook host {host} could not be resolved") from e
+    for address in addresses:
+        if not ipaddress.ip_address(address.split("%")[0]).is_global:
+            raise ValueError(f"webhook host {host} resolves to a non-public address")
+
+
+class JobQueue:
+    """Durable job queue in sqlite, processed by asyncio workers.
+
+    Jobs survive restarts: the worker running a job renews its lease
+    (heartbeat_at), and a "running" job whose lease is older than
+    JOB_LEASE_SECONDS was abandoned by a dead process and is claimed again,
+    until it reaches JOB_MAX_ATTEMPTS. Several server processes can share one
+    database; claiming a job is a single write transaction, and the claim
+    time (started_at) fences every later write, so a worker that lost its
+    lease cannot overwrite the job's new owner.
+    """
+
+    def __init__(self, path: str = JOBS_DB_PATH):
+        self.path = path
+        self.handlers = {}
+        self.wakeup = None
+        self.workers = []
+        self._local = threading.local()
+        self._db().executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        # Databases created before leases were renewed lack heartbeat_at
+        columns = {row["name"] for row in self._db().execute("PRAGMA table_info(jobs)")}
+        if "heartbeat_at" not in columns:
+            self._db().execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+
+    def _db(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets readers proceed during writes
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def register(self, kind: str, handler):
+        """`handler(payload, content)` is an async function returning the result dict"""
+        self.handlers[kind] = handler
+
+    def depth(self) -> int:
+        return self._db().execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+
+    def _insert(self, job_id: str, kind: str, payload: dict, content: bytes, webhook_url: str):
+        self._db().execute(
+            "INSERT INTO jobs (id, kind, status, payload, content, webhook_url, created_at) VALUES (?, ?, 'queued', ?, ?, ?, ?)",
+            (job_id, kind, json.dumps(payload), content, webhook_url, time.time()),
+        )
+
+    async def submit(self, kind: str, payload: dict, content: bytes = None, webhook_url: str = None) -> str:
+        job_id = uuid.uuid4().hex
+        await asyncio.to_thread(self._insert, job_id, kind, payload, content, webhook_url)
+        if self.wakeup is not None:
+            self.wakeup.set()
+        return job_id
+
+    def _get(self, job_id: str):
+        return self._db().execute(
+            "SELECT id, kind, status, attempts, result, error, webhook_status, created_at, started_at, finished_at FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+
+    async def get(self, job_id: str) -> dict:
+        """Public view of a job, or None if it does not exist"""
+        row = await asyncio.to_thread(self._get, job_id)
+        if row is None:
+            return None
+        job = {"job_id": row["id"], "kind": row["kind"], "status": row["status"], "attempts": row["attempts"]}
+        if row["started_at"]:
+            job["queued_ms"] = round((row["started_at"] - row["created_at"]) * 1000, 1)
+        if row["finished_at"]:
+            job["run_ms"] = round((row["finished_at"] - row["started_at"]) * 1000, 1)
+        if row["result"]:
+            job["result"] = json.loads(row["result"])
+        if row["error"]:
+            job["error"] = row["error"]
+        if row["webhook_status"]:
+            job["webhook_status"] = row["webhook_status"]
+        return job
+
+    def _claim(self):
+        db = self._db()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Interrupted too many times', finished_at = ?, content = NULL "
+                "WHERE status = 'running' AND COALESCE(heartbeat_at, started_at) < ? AND attempts >= ?",
+                (now, now - JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS),
+            )
+            row = db.execute(
+                "SELECT id, kind, payload, content, webhook_url, attempts, created_at FROM jobs "
+                "WHERE status = 'queued' OR (status = 'running' AND COALESCE(heartbeat_at, started_at) < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (now - JOB_LEASE_SECONDS,),
+            ).fetchone()
+            if row is not None:
+                db.execute(
+                    "UPDATE jobs SET status = 'running', started_at = ?, heartbeat_at = ?, attempts = attempts + 1 WHERE id = ?",
+                    (now, now, row["id"]),
+                )
+                # The claim time is this worker's lease token
+                row = dict(row, claimed_at=now)
+            db.execute("COMMIT")
+            return row
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    # Writes by the worker running a job only apply while it still holds the
+    # lease it claimed; each returns False if the job was reclaimed meanwhile
+    _LEASE_HELD = "WHERE id = ? AND status = 'running' AND started_at = ?"
+
+    def _renew(self, job_id: str, claimed_at: float) -> bool:
+        return self._db().execute(
+            f"UPDATE jobs SET heartbeat_at = ? {self._LEASE_HELD}", (time.time(), job_id, claimed_at),
+        ).rowcount > 0
+
+    def _finish(self, job_id: str, claimed_at: float, status: str, result: dict, error: str) -> bool:
+        # The upload is only needed while the job can still run
+        return self._db().execute(
+            f"UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, content = NULL {self._LEASE_HELD}",
+            (status, json.dumps(result) if result is not None else None, error, time.time(), job_id, claimed_at),
+        ).rowcount > 0
+
+    def _requeue(self, job_id: str, claimed_at: float) -> bool:
+        # Put back without using up an attempt
+        return self._db().execute(
+            f"UPDATE jobs SET status = 'queued', started_at = NULL, heartbeat_at = NULL, attempts = attempts - 1 {self._LEASE_HELD}",
+            (job_id, claimed_at),
+        ).rowcount > 0
+
+    async def _keep_lease(self, job_id: str, claimed_at: float, kind: str):
+        """Renew the lease while the job runs, well before it could lapse"""
+        while True:
+            await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+            try:
+                if not await asyncio.to_thread(self._renew, job_id, claimed_at):
+                    log_error(f"Job {job_id} lost its lease to another worker", f"job-{kind}")
+                    return
+            except Exception as e:
+                log_error(f"Renewing the lease of job {job_id} failed: {e}", f"job-{kind}")
+
+    def _set_webhook_status(self, job_id: str, webhook_status: str):
+        self._db().execute("UPDATE jobs SET webhook_status = ? WHERE id = ?", (webhook_status, job_id))
+
+    def _purge(self) -> int:
+        return self._db().execute(
+            "DELETE FROM jobs WHERE status IN ('succeeded', 'failed') AND finished_at < ?",
+            (time.time() - JOB_RETENTION_SECONDS,),
+        ).rowcount
+
+    async def start(self, workers: int = JOB_WORKERS):
+        purged = await asyncio.to_thread(self._purge)
+        if purged:
+            logger.info(f"Job queue: purged {purged} expired job(s)")
+        self.wakeup = asyncio.Event()
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(workers)]
+
+    async def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    async def _worker(self):
+        # Jobs yield to interactive requests at the OCR, LLM and submit caps
+        workload_class.set(BULK)
+        while True:
+            # Cleared before claiming so a submit during the claim is not missed
+            self.wakeup.clear()
+            try:
+                row = await asyncio.to_thread(self._claim)
+                if row is not None:
+                    await self._run(row)
+                    continue
+            except Exception as e:
+                # e.g. "database is locked"; a job left running is reclaimed when its lease lapses
+                log_error(f"Job worker failed: {e}", "jobs")
+            # Sleep until a local submit, or poll for jobs added by other processes
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, row):
+        job_id, kind, claimed_at = row["id"], row["kind"], row["claimed_at"]
+        started = time.time()
+        JOB_WAIT_LATENCY.observe(started - row["created_at"], kind)
+
+        # Each job gets its own trace so stage metrics and logs are recorded as for requests
+        trace = start_trace(f"job {kind}")
+        result, error, overloaded = None, None, None
+        lease = asyncio.create_task(self._keep_lease(job_id, claimed_at, kind))
+        try:
+            handler = self.handlers.get(kind)
+            if handler is None:
+                raise ValueError(f"No handler for job kind {kind!r}")
+            result = await handler(json.loads(row["payload"]), row["content"])
+            status = "succeeded" if result.get("success") else "failed"
+        except Overloaded as e:
+            overloaded = e
+        except Exception as e:
+            log_error(f"Job {job_id} failed: {e}", f"job-{kind}")
+            status, error = "failed", str(e)
+        finally:
+            lease.cancel()
+            trace.finish()
+            export_trace(trace)
+
+        if overloaded is not None:
+            # A capped stage is full; put the job back and back off rather than fail it
+            if await asyncio.to_thread(self._requeue, job_id, claimed_at):
+                await asyncio.sleep(overloaded.retry_after)
+            return
+
+        if not await asyncio.to_thread(self._finish, job_id, claimed_at, status, result, error):
+            log_error(f"Job {job_id} was reclaimed while running; its result was discarded", f"job-{kind}")
+            return
+        JOB_RUN_LATENCY.observe(time.time() - started, kind)
+        JOBS_FINISHED.inc(kind, status)
+
+        if row["webhook_url"]:
+            await self._notify(row["webhook_url"], job_id)
+
+    async def _notify(self, url: str, job_id: str):
+        """POST the finished job to its webhook, retrying with backoff"""
+        job = await self.get(job_id)
+        webhook_status = "failed"
+        try:
+            # Again at delivery: the host's addresses may have changed since submit
+            await asyncio.to_thread(check_webhook_url, url)
+        except ValueError as e:
+            log_error(f"Webhook for job {job_id} not sent: {e}", "jobs")
+            await asyncio.to_thread(self._set_webhook_status, job_id, "failed (address not allowed)")
+            return
+        async with httpx.AsyncClient(timeout=WEBHOOK_TIMEOUT) as client:
+            for attempt in range(WEBHOOK_RETRIES):
+                try:
+                    response = await client.post(url, json=job)
+                    if response.status_code < 300:
+                        webhook_status = "delivered"
+                        record_outbound("webhook")
+                        break
+                    webhook_status = f"failed ({response.status_code})"
+                except httpx.HTTPError as e:
+                    webhook_status = f"failed ({type(e).__name__})"
+                record_outbound("webhook", ok=False)
+                if attempt + 1 < WEBHOOK_RETRIES:
+                    await asyncio.sleep(2 ** attempt)
+        await asyncio.to_thread(self._set_webhook_status, job_id, webhook_status)
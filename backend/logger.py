@@ -1,30 +1,142 @@
+import atexit
 import logging
+import queue
 import sys
-from datetime import datetime
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from .config import (
+    LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_QUEUE_SIZE,
+    LOG_MAX_FIELD_CHARS, LOG_MAX_ERROR_CHARS, LOG_SAMPLE_THRESHOLD, LOG_SAMPLE_RATE
 )
+from .models import dumps
+from .tracing import current_request_id
+
+# Fields that are never written in full: large payloads are summarized by
+# size, secrets are masked
+LARGE_FIELDS = {"raw_text", "filled_data", "response_snippet"}
+SECRET_FIELDS = {"api_key", "authorization", "openrouter_api_key", "llama_cloud_api_key"}
+MAX_LIST_ITEMS = 20
+
+
+class JsonLineFormatter(logging.Formatter):
+    """One JSON object per line; runs on the listener thread, not the event loop"""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in ("request_id", "event", "endpoint", "context", "data"):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return dumps(entry, default=str).decode("utf-8")
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands records to a bounded queue and drops them instead of blocking when it is full"""
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting is deferred to the listener thread; only the request ID,
+        # which lives in a context variable, has to be captured here
+        record.request_id = current_request_id()
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _Sampler:
+    """Keeps every record up to LOG_SAMPLE_THRESHOLD per second, then 1 in LOG_SAMPLE_RATE"""
+    def __init__(self, threshold: int, rate: int):
+        self.threshold = threshold
+        self.rate = max(rate, 1)
+        self.window = 0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def keep(self) -> bool:
+        now = int(time.monotonic())
+        with self.lock:
+            if now != self.window:
+                self.window = now
+                self.count = 0
+            self.count += 1
+            return self.count <= self.threshold or self.count % self.rate == 0
+
+
+def _compact(value, depth: int = 0):
+    """Copy a payload for logging, truncating long strings and summarizing large fields"""
+    if isinstance(value, str):
+        if len(value) > LOG_MAX_FIELD_CHARS:
+            return f"{value[:LOG_MAX_FIELD_CHARS]}...(+{len(value) - LOG_MAX_FIELD_CHARS} chars)"
+        return value
+    if depth >= 4:
+        return "<nested>"
+    if isinstance(value, dict):
+        compacted = {}
+        for key, item in value.items():
+            lowered = str(key).lower()
+            if lowered in SECRET_FIELDS:
+                compacted[key] = "<redacted>"
+            elif lowered in LARGE_FIELDS and item:
+                compacted[key] = f"<{len(item)} {'chars' if isinstance(item, str) else 'items'}>"
+            else:
+                compacted[key] = _compact(item, depth + 1)
+        return compacted
+    if isinstance(value, (list, tuple)):
+        items = [_compact(item, depth + 1) for item in value[:MAX_LIST_ITEMS]]
+        if len(value) > MAX_LIST_ITEMS:
+            items.append(f"...(+{len(value) - MAX_LIST_ITEMS} items)")
+        return items
+    return value
+
+
+log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+queue_handler = NonBlockingQueueHandler(log_queue)
+
+_formatter = JsonLineFormatter()
+_file_handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT)
+_stream_handler = logging.StreamHandler(sys.stdout)
+for _handler in (_file_handler, _stream_handler):
+    _handler.setFormatter(_formatter)
+
+# Configure logging: callers only enqueue, a background thread does the I/O
+logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+listener = QueueListener(log_queue, _file_handler, _stream_handler, respect_handler_level=True)
+listener.start()
+atexit.register(listener.stop)
 
 logger = logging.getLogger(__name__)
+_sampler = _Sampler(LOG_SAMPLE_THRESHOLD, LOG_SAMPLE_RATE)
 
 def log_request(endpoint: str, data: dict = None):
-    logger.info(f"REQUEST {endpoint}: {data}")
+    if _sampler.keep():
+        logger.info("REQUEST", extra={"event": "request", "endpoint": endpoint, "data": _compact(data)})
 
 def log_response(endpoint: str, response: dict):
-    logger.info(f"RESPONSE {endpoint}: {response}")
+    if _sampler.keep():
+        logger.info("RESPONSE", extra={"event": "response", "endpoint": endpoint, "data": _compact(response)})
 
 def log_resume_data(data: dict):
-    logger.info(f"EXTRACTED RESUME DATA: {data}")
+    if _sampler.keep():
+        logger.info("EXTRACTED RESUME DATA", extra={"event": "resume_data", "data": _compact(data)})
 
 def log_form_fields(fields: dict):
-    logger.info(f"FORM FIELDS DETECTED: {fields}")
+    if _sampler.keep():
+        logger.info("FORM FIELDS DETECTED", extra={"event": "form_fields", "data": _compact(fields)})
 
 def log_error(error: str, context: str = ""):
-    logger.error(f"ERROR {context}: {error}")
\ No newline at end of file
+    # Errors are never sampled
+    logger.error(str(error)[:LOG_MAX_ERROR_CHARS], extra={"event": "error", "context": context})
@@ -1,22 +1,113 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
+import asyncio
 import httpx
+import math
+import mmap
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
-from .services.resume_parser import ResumeParser
-from .services.form_analyzer import FormAnalyzer
-from .services.form_filler import FormFiller
+from .config import ADMIN_TOKEN, JOB_DEADLINE_SECONDS, MAX_UPLOAD_BYTES, REQUEST_DEADLINE_SECONDS, UPLOAD_MEMORY_BYTES, WARMUP, WORKER_THREADS
+from .models import dumps
+from .services.resume_parser import ResumeParser, read_in_thread, reap_stale_uploads
 from .services.google_forms_service import GoogleFormsService
-from .logger import log_request, log_response, log_error
+from .logger import logger, log_queue, log_request, log_response, log_error
+from .metrics import ADMISSION_REJECTIONS, QUEUE_DEPTH, REQUESTS, REQUEST_LATENCY, render_metrics
+from .tracing import start_trace, export_trace, export_queue_depth
+from .jobs import JobQueue, check_webhook_url
+from .outbox import SubmissionOutbox
+from .admission import BULK, ClientRateLimiter, Overloaded, client_key, workload_class
+from .deadline import Deadline, DeadlineExceeded
+from .warmup import warm_up
+from .profiling import PROFILE_HEADER, should_profile, begin_profile, end_profile, list_profiles, profile_path
 import traceback
 
 load_dotenv()
 
-app = FastAPI(title="Auto Form Filling Agent", version="1.0.0")
+class CountingExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor that counts submitted calls not yet picked up by a thread"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self.waiting = 0
+
+    def _started(self):
+        with self._lock:
+            self.waiting -= 1
+
+    def submit(self, fn, /, *args, **kwargs):
+        def run():
+            self._started()
+            return fn(*args, **kwargs)
+
+        with self._lock:
+            self.waiting += 1
+        try:
+            future = super().submit(run)
+        except BaseException:
+            self._started()
+            raise
+        # A call cancelled before it starts never runs
+        future.add_done_callback(lambda f: f.cancelled() and self._started())
+        return future
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Remove upload copies leaked by earlier versions when LlamaParse failed
+    removed = reap_stale_uploads()
+    if removed:
+        logger.info(f"Reaped {removed} stale temp upload(s)")
+
+    # Own the executor behind asyncio.to_thread so its backlog can be reported
+    executor = CountingExecutor(max_workers=WORKER_THREADS, thread_name_prefix="worker")
+    asyncio.get_running_loop().set_default_executor(executor)
+    QUEUE_DEPTH.set_function(lambda: executor.waiting, "worker_executor")
+    QUEUE_DEPTH.set_function(log_queue.qsize, "log")
+    QUEUE_DEPTH.set_function(export_queue_depth, "trace_export")
+
+    # Form submissions are recorded before sending and retried in the background
+    app.state.outbox = SubmissionOutbox(GoogleFormsService().send_submission)
+    QUEUE_DEPTH.set_function(app.state.outbox.depth, "submission_outbox")
+    await app.state.outbox.start()
+
+    # Background fill-form jobs
+    app.state.jobs = JobQueue()
+    app.state.jobs.register("fill-form", run_fill_form_job)
+    QUEUE_DEPTH.set_function(app.state.jobs.depth, "fill_form_jobs")
+    await app.state.jobs.start()
+
+    # /api/health answers right away; /api/ready waits for the warm-up
+    app.state.ready = not WARMUP
+    app.state.warmup = {}
+    warmup = asyncio.create_task(warm_up_app(app)) if WARMUP else None
+    yield
+    if warmup is not None:
+        warmup.cancel()
+        await asyncio.gather(warmup, return_exceptions=True)
+    await app.state.jobs.stop()
+    await app.state.outbox.stop()
+
+async def warm_up_app(app: FastAPI):
+    app.state.warmup = await warm_up()
+    app.state.ready = True
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when it is installed"""
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+app = FastAPI(title="Auto Form Filling Agent", version="1.0.0", lifespan=lifespan, default_response_class=FastJSONResponse)
+# Not ready until the lifespan has started (and the warm-up finished)
+app.state.ready = False
+app.state.warmup = {}
 
 # Add CORS configuration
 app.add_middleware(
@@ -32,21 +123,182 @@ frontend_build_path = Path(__file__).parent.parent / "frontend" / "build"
 if frontend_build_path.exists():
     app.mount("/static", StaticFiles(directory=str(frontend_build_path / "static")), name="static")
 
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Every request gets an ID and a trace; stage spans are recorded by the services.
+
+    Endpoints that do their work while the body streams set
+    `request.state.streaming`; their trace, metrics and profile are finished
+    when the body ends, so they carry no Server-Timing or X-Profile-Name
+    header.
+    """
+    trace = start_trace(f"{request.method} {request.url.path}")
+    reason = should_profile(request.headers.get(PROFILE_HEADER, ""))
+    profile = begin_profile(trace.request_id, request.url.path, reason) if reason else None
+    started = time.perf_counter()
+    status = 500
+
+    def finish():
+        if profile is not None:
+            end_profile(profile)
+        trace.finish()
+        # Label by route template so SPA paths don't create a series each
+        route = request.scope.get("route")
+        endpoint = route.path if route is not None else "unmatched"
+        REQUESTS.inc(endpoint, request.method, str(status))
+        REQUEST_LATENCY.observe(time.perf_counter() - started, endpoint)
+        export_trace(trace)
+
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    except BaseException:
+        finish()
+        raise
+    response.headers["X-Request-ID"] = trace.request_id
+    if getattr(request.state, "streaming", False):
+        response.body_iterator = finish_after(response.body_iterator, finish, profile)
+        return response
+
+    finish()
+    response.headers["Server-Timing"] = trace.server_timing()
+    if profile is not None:
+        response.headers["X-Profile-Name"] = await asyncio.to_thread(profile.save)
+    return response
+
+async def finish_after(body, finish, profile):
+    """Pass a response body through, then finish its request's trace"""
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        finish()
+        if profile is not None:
+            # Not awaited: this also runs when the client disconnects mid-stream
+            asyncio.get_running_loop().run_in_executor(None, profile.save)
+
+# Allowance for multipart boundaries and form fields on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+def upload_too_large_message() -> str:
+    if MAX_UPLOAD_BYTES >= 1024 * 1024:
+        return f"File too large (max {MAX_UPLOAD_BYTES / (1024 * 1024):.3g} MB)"
+    return f"File too large (max {MAX_UPLOAD_BYTES / 1024:.3g} KB)"
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    # Reject oversized uploads from the Content-Length header before the body is read
+    content_length = request.headers.get("content-length", "")
+    if request.method == "POST" and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES:
+        log_error(f"Upload rejected: {content_length} bytes", request.url.path)
+        return JSONResponse(status_code=413, content={"success": False, "error": upload_too_large_message()})
+    return await call_next(request)
+
+# Endpoints that reach OCR, the LLM or Google Forms; each client's use of them is rate limited
+RATE_LIMITED_PATHS = ("/api/parse-resume", "/api/fill-form", "/api/fill-form/stream", "/api/jobs/fill-form", "/api/analyze-form")
+rate_limiter = ClientRateLimiter()
+
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    # Batch clients mark their requests so they yield to interactive users at the capped stages
+    if request.headers.get("x-workload", "").lower() == BULK:
+        workload_class.set(BULK)
+    if request.method == "POST" and request.url.path in RATE_LIMITED_PATHS:
+        peer = request.client.host if request.client else ""
+        retry_after = rate_limiter.check(client_key(request.headers.get("x-forwarded-for", ""), peer))
+        if retry_after:
+            ADMISSION_REJECTIONS.inc("rate_limit", workload_class.get())
+            return JSONResponse(status_code=429, content={"success": False, "error": "Rate limit exceeded"},
+                                headers={"Retry-After": str(math.ceil(retry_after))})
+    return await call_next(request)
+
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    return JSONResponse(status_code=503, content={"success": False, "error": str(exc)}, headers={"Retry-After": str(exc.retry_after)})
+
+@app.exception_handler(DeadlineExceeded)
+async def deadline_handler(request: Request, exc: DeadlineExceeded):
+    # 499 (client closed request) keeps disconnects apart from timeouts in the metrics
+    return JSONResponse(status_code=499 if exc.cancelled else 504, content={"success": False, "error": str(exc)})
+
+async def wait_for_disconnect(request: Request):
+    # The body has been read by now, so the only message left is the disconnect.
+    # (Request.is_disconnected() can't see it through the http middlewares)
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+async def until_disconnected(request: Request, deadline: Deadline, awaitable):
+    """Await the pipeline, cancelling it if the client goes away first.
+
+    Cancelling the deadline as well stops stages running in worker threads
+    (PDF text, OCR) at their next check; the cancelled pipeline is awaited so
+    the caller doesn't release the upload while a thread still reads it.
+    """
+    task = asyncio.ensure_future(awaitable)
+    watcher = asyncio.ensure_future(wait_for_disconnect(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        if task.done():
+            return task.result()
+        deadline.cancel()
+        raise DeadlineExceeded("client disconnect", cancelled=True)
+    finally:
+        task.cancel()
+        watcher.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
 class FormFillRequest(BaseModel):
     form_url: str
 
+def check_upload_size(file: UploadFile) -> int:
+    """Size of the upload in bytes; 413 if it is over MAX_UPLOAD_BYTES"""
+    spool = file.file
+    spool.seek(0, os.SEEK_END)
+    size = spool.tell()
+    spool.seek(0)
+    if size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=upload_too_large_message())
+    return size
+
+async def read_upload(file: UploadFile):
+    """Return a small upload as bytes, or a read-only mmap of its spooled temp file.
+
+    Starlette already streams multipart files into a SpooledTemporaryFile, so
+    large uploads are mapped from disk rather than copied into memory.
+    """
+    size = check_upload_size(file)
+    if size <= UPLOAD_MEMORY_BYTES:
+        return await file.read()
+    return mmap.mmap(file.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+def release_upload(content):
+    if isinstance(content, mmap.mmap):
+        content.close()
+
+def select_fields(data: dict, fields: str = None, drop: tuple = (), keep: tuple = ()) -> dict:
+    """Limit a payload to the comma-separated `fields`, or else remove the `drop` keys.
+
+    Keys in `keep` are always returned.
+    """
+    if fields:
+        wanted = {f.strip() for f in fields.split(',') if f.strip()}
+        return {k: v for k, v in data.items() if k in wanted or k in keep}
+    return {k: v for k, v in data.items() if k not in drop}
+
 @app.post("/api/parse-resume")
-async def parse_resume(file: UploadFile = File(...)):
+async def parse_resume(request: Request, file: UploadFile = File(...), policy: str = None, fields: str = None, include_raw: bool = False):
     # Avoid accessing UploadFile.size (not provided); log filename only
     log_request("/api/parse-resume", {"filename": file.filename})
+    deadline = Deadline(REQUEST_DEADLINE_SECONDS)
+    content = None
     try:
         if not file.filename.endswith(('.pdf', '.docx', '.txt')):
             log_error(f"Unsupported file format: {file.filename}", "parse-resume")
             raise HTTPException(status_code=400, detail="Unsupported file format")
 
         parser = ResumeParser()
-        content = await file.read()
-        extracted_data = await parser.extract_data(content, file.filename)
+        content = await read_upload(file)
+        extracted_data = await until_disconnected(request, deadline, parser.extract_data(content, file.filename, policy, deadline))
 
         # Check if PDF is ATS-friendly
         if not extracted_data.get('ats_friendly', True):
@@ -60,14 +312,48 @@ async def parse_resume(file: UploadFile = File(...)):
             log_response("/api/parse-resume", response)
             return response
 
-        response = {"success": True, "ats_friendly": True, "data": extracted_data}
+        # raw_text is the bulk of the payload and the UI never shows it
+        data = select_fields(extracted_data, fields, () if include_raw else ("raw_text",))
+        response = {"success": True, "ats_friendly": True, "data": data}
         log_response("/api/parse-resume", response)
         return response
+    except (Overloaded, DeadlineExceeded):
+        raise
+    except HTTPException as e:
+        return JSONResponse(status_code=e.status_code, content={"success": False, "error": e.detail})
     except Exception as e:
         tb = traceback.format_exc()
         log_error(f"{str(e)}\n{tb}", "parse-resume")
         # Return structured error so frontend gets JSON instead of an HTTP 500
         return {"success": False, "error": str(e)}
+    finally:
+        release_upload(content)
+
+@app.post("/api/check-ats")
+async def check_ats(file: UploadFile = File(...)):
+    log_request("/api/check-ats", {"filename": file.filename})
+    content = None
+    try:
+        if not file.filename.endswith(('.pdf', '.docx', '.txt')):
+            log_error(f"Unsupported file format: {file.filename}", "check-ats")
+            raise HTTPException(status_code=400, detail="Unsupported file format")
+
+        parser = ResumeParser()
+        content = await read_upload(file)
+        # PDF parsing and stream decompression stay off the event loop
+        result = await read_in_thread(parser.check_ats_readiness, content, file.filename)
+
+        response = {"success": True, **result}
+        log_response("/api/check-ats", response)
+        return response
+    except HTTPException as e:
+        return JSONResponse(status_code=e.status_code, content={"success": False, "error": e.detail})
+    except Exception as e:
+        tb = traceback.format_exc()
+        log_error(f"{str(e)}\n{tb}", "check-ats")
+        return {"success": False, "error": str(e)}
+    finally:
+        release_upload(content)
 
 @app.post("/api/analyze-form")
 async def analyze_form(request: FormFillRequest):
@@ -85,42 +371,192 @@ async def analyze_form(request: FormFillRequest):
         log_error(f"{str(e)}\n{tb}", "analyze-form")
         return {"success": False, "error": str(e)}
 
+async def fill_form_pipeline(content, filename: str, form_url: str, policy: str = None, progress=None, deadline: Deadline = None) -> dict:
+    """Parse the resume and submit it to the form; shared by /api/fill-form, its
+    streaming variant and fill-form jobs. `progress(stage, data)` is called as
+    each stage finishes; `deadline` bounds the whole pipeline.
+    """
+    parser = ResumeParser()
+    google_forms = GoogleFormsService(outbox=getattr(app.state, "outbox", None))
+
+    # Parse resume
+    resume_data = await parser.extract_data(content, filename, policy, deadline)
+    ats_friendly = resume_data.get('ats_friendly', True)
+    if progress:
+        if ats_friendly:
+            progress("parsed", {"data": select_fields(resume_data, drop=("raw_text", "success", "ats_friendly"))})
+        progress("ats", {"ats_friendly": ats_friendly})
+
+    # Check if PDF is ATS-friendly
+    if not ats_friendly:
+        return {
+            "success": False,
+            "ats_friendly": False,
+            "error": resume_data.get('error', 'PDF is not ATS-friendly'),
+            "message": resume_data.get('message', 'Cannot fill form with non-ATS-friendly PDF'),
+            "suggestions": resume_data.get('suggestions', [])
+        }
+
+    # Submit form directly using Google Forms API
+    return await google_forms.submit_form_response(form_url, resume_data, progress, deadline)
+
 @app.post("/api/fill-form")
 async def fill_form(
+    request: Request,
     form_url: str = Form(...),
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    policy: str = None,
+    fields: str = None,
+    include_raw: bool = False
 ):
     log_request("/api/fill-form", {"form_url": form_url, "filename": file.filename})
+    deadline = Deadline(REQUEST_DEADLINE_SECONDS)
+    content = None
     
     try:
-        parser = ResumeParser()
-        google_forms = GoogleFormsService()
-        
-        # Parse resume
-        content = await file.read()
-        resume_data = await parser.extract_data(content, file.filename)
-        
-        # Check if PDF is ATS-friendly
-        if not resume_data.get('ats_friendly', True):
-            result = {
-                "success": False,
-                "ats_friendly": False,
-                "error": resume_data.get('error', 'PDF is not ATS-friendly'),
-                "message": resume_data.get('message', 'Cannot fill form with non-ATS-friendly PDF'),
-                "suggestions": resume_data.get('suggestions', [])
-            }
-            log_response("/api/fill-form", result)
-            return result
-        
-        # Submit form directly using Google Forms API
-        result = await google_forms.submit_form_response(form_url, resume_data)
+        content = await read_upload(file)
+        result = await until_disconnected(request, deadline, fill_form_pipeline(content, file.filename, form_url, policy, deadline=deadline))
+        if result.get('ats_friendly', True):
+            # filled_data duplicates filled_fields, so it is only sent on request
+            result = select_fields(result, fields, () if include_raw else ("filled_data",), keep=("success", "error"))
         
         log_response("/api/fill-form", result)
         return result
+    except (Overloaded, DeadlineExceeded):
+        raise
+    except HTTPException as e:
+        return JSONResponse(status_code=e.status_code, content={"success": False, "error": e.detail})
     except Exception as e:
         tb = traceback.format_exc()
         log_error(f"{str(e)}\n{tb}", "fill-form")
         return {"success": False, "error": str(e)}
+    finally:
+        release_upload(content)
+
+# Proxies close idle connections, so quiet stretches (LLM calls) get a comment line
+SSE_HEARTBEAT_SECONDS = 15
+
+def sse_event(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+@app.post("/api/fill-form/stream")
+async def fill_form_stream(
+    request: Request,
+    form_url: str = Form(...),
+    file: UploadFile = File(...),
+    policy: str = None
+):
+    """/api/fill-form as server-sent events.
+
+    Emits parsed, ats, form_schema, mapped and submitted as each stage
+    finishes, then done with the same payload /api/fill-form returns (or
+    error).
+    """
+    log_request("/api/fill-form/stream", {"form_url": form_url, "filename": file.filename})
+    try:
+        check_upload_size(file)
+    except HTTPException as e:
+        return JSONResponse(status_code=e.status_code, content={"success": False, "error": e.detail})
+    # The pipeline runs while the body streams: finish the trace when it ends
+    request.state.streaming = True
+
+    async def events():
+        # Read (and possibly map) the upload only once the body has started,
+        # so there is nothing to release if the client leaves before that
+        deadline = Deadline(REQUEST_DEADLINE_SECONDS)
+        content = await read_upload(file)
+        queue = asyncio.Queue()
+        task = asyncio.create_task(fill_form_pipeline(content, file.filename, form_url, policy, lambda *event: queue.put_nowait(event), deadline))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                if event is None:
+                    break
+                yield sse_event(*event)
+
+            result = task.result()
+            if result.get('ats_friendly', True):
+                result = select_fields(result, drop=("filled_data",))
+            log_response("/api/fill-form/stream", result)
+            yield sse_event("done", result)
+        except Overloaded as e:
+            yield sse_event("error", {"success": False, "error": str(e), "retry_after": e.retry_after})
+        except Exception as e:
+            tb = traceback.format_exc()
+            log_error(f"{str(e)}\n{tb}", "fill-form-stream")
+            yield sse_event("error", {"success": False, "error": str(e)})
+        finally:
+            # Also reached when the client disconnects mid-stream. Wait for the
+            # pipeline (and the threads reading the upload) before unmapping it
+            deadline.cancel()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            release_upload(content)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+async def run_fill_form_job(payload: dict, content: bytes) -> dict:
+    # The job queue renews the lease while this runs; the deadline only bounds runaway work
+    deadline = Deadline(JOB_DEADLINE_SECONDS)
+    result = await fill_form_pipeline(content, payload["filename"], payload["form_url"], payload.get("policy"), deadline=deadline)
+    return select_fields(result, drop=("filled_data",))
+
+@app.post("/api/jobs/fill-form", status_code=202)
+async def submit_fill_form_job(
+    form_url: str = Form(...),
+    file: UploadFile = File(...),
+    webhook_url: str = Form(None),
+    policy: str = None
+):
+    """Queue a fill-form job and return its ID immediately.
+
+    Poll GET /api/jobs/{job_id}, or pass webhook_url to have the finished job
+    POSTed to it.
+    """
+    log_request("/api/jobs/fill-form", {"form_url": form_url, "filename": file.filename, "webhook_url": webhook_url})
+    content = None
+    try:
+        if not file.filename.endswith(('.pdf', '.docx', '.txt')):
+            raise HTTPException(status_code=400, detail="Unsupported file format")
+        if webhook_url:
+            try:
+                await asyncio.to_thread(check_webhook_url, webhook_url)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        content = await read_upload(file)
+        payload = {"form_url": form_url, "filename": file.filename, "policy": policy}
+        job_id = await app.state.jobs.submit("fill-form", payload, bytes(content), webhook_url)
+        response = {"success": True, "job_id": job_id, "status": "queued", "status_url": f"/api/jobs/{job_id}"}
+        log_response("/api/jobs/fill-form", response)
+        return response
+    except HTTPException as e:
+        return JSONResponse(status_code=e.status_code, content={"success": False, "error": e.detail})
+    except Exception as e:
+        tb = traceback.format_exc()
+        log_error(f"{str(e)}\n{tb}", "jobs")
+        return JSONResponse(status_code=500, content={"success": False, "error": str(e)})
+    finally:
+        release_upload(content)
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await app.state.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"success": True, **job}
+
+@app.get("/api/submissions/{submission_id}")
+async def get_submission(submission_id: str):
+    submission = await app.state.outbox.get(submission_id)
+    if submission is None:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    return {"success": True, **submission}
 
 @app.get("/api/hello")
 async def hello_world():
@@ -130,6 +566,38 @@ async def hello_world():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/api/ready")
+async def readiness_check():
+    """503 until the startup warm-up has finished; for load balancer readiness checks"""
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready", "warmup": app.state.warmup}
+
+@app.get("/api/metrics")
+async def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+def require_admin(request: Request):
+    # Admin endpoints are disabled unless ADMIN_TOKEN is configured
+    if not ADMIN_TOKEN or request.headers.get("X-Admin-Token") != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+@app.get("/api/admin/profiles")
+async def get_profiles(request: Request):
+    require_admin(request)
+    return {"profiles": await asyncio.to_thread(list_profiles)}
+
+@app.get("/api/admin/profiles/{name}")
+async def get_profile(name: str, request: Request, format: str = "json"):
+    """Summary with the top functions, or the raw pstats file with ?format=prof"""
+    require_admin(request)
+    path = profile_path(name, "prof" if format == "prof" else "json")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "prof":
+        return FileResponse(path, media_type="application/octet-stream", filename=f"{name}.prof")
+    return FileResponse(path, media_type="application/json")
+
 # Serve frontend index.html for all non-API routes (SPA support)
 @app.get("/{full_path:path}")
 async def serve_frontend(full_path: str):
@@ -142,7 +610,7 @@ async def serve_frontend(full_path: str):
         return FileResponse(index_file)
     
     # If frontend not built, return API-only message
-    return {"message": "API is running. Frontend not built yet.", "endpoints": ["/api/health", "/api/parse-resume", "/api/fill-form"]}
+    return {"message": "API is running. Frontend not built yet.", "endpoints": ["/api/health", "/api/ready", "/api/parse-resume", "/api/check-ats", "/api/fill-form", "/api/fill-form/stream", "/api/jobs/fill-form"]}
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,142 @@
+import bisect
+import threading
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from fast local stages up to slow LLM/OCR calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry = []
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.values = {}
+        self.lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, *label_values, amount: float = 1):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def get(self, *label_values) -> float:
+        return self.values.get(label_values, 0)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        # Worker threads increment counters too; a new label during the scrape would break iteration
+        with self.lock:
+            snapshot = dict(self.values)
+        for label_values, value in sorted(snapshot.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose samples are read from a callback at scrape time"""
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.sources = {}
+        _registry.append(self)
+
+    def set_function(self, fn, *label_values):
+        self.sources[label_values] = fn
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        for label_values, fn in sorted(self.sources.items()):
+            try:
+                value = fn()
+            except Exception:
+                continue
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self.series = {}
+        self.lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value: float, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            snapshot = {k: ([*v[0]], v[1], v[2]) for k, v in self.series.items()}
+        for label_values, (counts, total, count) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, label_values)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, label_values)} {count}")
+        return lines
+
+
+def render_metrics() -> str:
+    """Prometheus text exposition format for every registered metric"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by endpoint, method and status", ("endpoint", "method", "status"))
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency by endpoint", ("endpoint",))
+STAGE_LATENCY = Histogram("pipeline_stage_duration_seconds", "Pipeline stage latency (parse, ocr, llm, form_fetch, form_submit, ...)", ("stage",))
+STAGE_ERRORS = Counter("pipeline_stage_errors_total", "Pipeline stages that raised", ("stage",))
+QUEUE_DEPTH = Gauge("queue_depth", "Items waiting in internal queues and executors", ("queue",))
+JOB_WAIT_LATENCY = Histogram("job_queue_wait_seconds", "Time jobs spend queued before a worker picks them up", ("kind",))
+JOB_RUN_LATENCY = Histogram("job_run_duration_seconds", "Time workers spend running a job", ("kind",))
+JOBS_FINISHED = Counter("jobs_finished_total", "Finished jobs by kind and status", ("kind", "status"))
+STAGE_IN_FLIGHT = Gauge("stage_in_flight", "Requests holding a slot in a capped stage (ocr, llm, submit)", ("stage",))
+ADMISSION_REJECTIONS = Counter("admission_rejections_total", "Requests turned away by rate limits (rate_limit) or full stage queues (ocr, llm, submit), by workload class", ("reason", "class"))
+ADMISSION_WAIT = Histogram("admission_wait_seconds", "Time spent waiting for a slot in a capped stage, by stage and workload class", ("stage", "class"))
+OUTBOX_SUBMISSIONS = Counter("outbox_submissions_total", "Form submission attempts by outcome (sent, retry, failed, duplicate)", ("outcome",))
+OUTBOUND_REQUESTS = Counter("outbound_requests_total", "Outbound calls by target and outcome", ("target", "outcome"))
+
+
+def record_outbound(target: str, ok: bool = True):
+    OUTBOUND_REQUESTS.inc(target, "ok" if ok else "error")
+
+
+@contextmanager
+def outbound(target: str):
+    """Count an outbound call to `target`, marking it as an error if it raises"""
+    try:
+        yield
+    except Exception:
+        record_outbound(target, ok=False)
+        raise
+    record_outbound(target)
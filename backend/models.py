@@ -0,0 +1,147 @@
+import json
+import re
+from dataclasses import dataclass, field
+
+# orjson is optional; the stdlib encoder is used when it is not installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Keys that different extractors (deterministic, LlamaParse + LLM, callers)
+# use for the same profile field, in order of preference
+FIELD_ALIASES = {
+    "full_name": ("Full Name", "full_name", "name", "Name"),
+    "email": ("Email", "email"),
+    "phone": ("Phone Number", "Phone", "phone", "phone_number"),
+    "address": ("Address", "address", "location"),
+    "education": ("Education", "education"),
+    "work_experience": ("Work Experience", "work_experience", "experience", "Experience"),
+    "skills": ("Skills", "skills"),
+    "raw_text": ("raw_text",),
+}
+
+SKILL_SPLIT_PATTERN = re.compile(r"[;,\n]")
+
+
+def _first_value(data: dict, keys: tuple):
+    for key in keys:
+        value = data.get(key)
+        if value:
+            return value
+    return None
+
+
+def _as_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(v).strip() for v in value if v)
+    return str(value).strip()
+
+
+def _as_lines(value) -> list:
+    """Coerce a list, newline-separated string or single dict into a list of items"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [line.strip() for line in value.split("\n") if line.strip()]
+    if isinstance(value, dict):
+        return [value]
+    return [v for v in value if v]
+
+
+@dataclass(slots=True)
+class EducationEntry:
+    text: str
+    degree: str = ""
+    institution: str = ""
+
+    @classmethod
+    def from_value(cls, value) -> "EducationEntry":
+        if isinstance(value, dict):
+            degree = _as_text(value.get("degree"))
+            institution = _as_text(value.get("institution") or value.get("school"))
+            text = _as_text(value.get("text")) or " from ".join(p for p in (degree, institution) if p)
+            return cls(text=text, degree=degree, institution=institution)
+        return cls(text=_as_text(value))
+
+    def __str__(self) -> str:
+        return self.text
+
+
+@dataclass(slots=True)
+class ExperienceEntry:
+    text: str
+    position: str = ""
+    company: str = ""
+
+    @classmethod
+    def from_value(cls, value) -> "ExperienceEntry":
+        if isinstance(value, dict):
+            position = _as_text(value.get("position") or value.get("title"))
+            company = _as_text(value.get("company"))
+            text = _as_text(value.get("text")) or " at ".join(p for p in (position, company) if p)
+            return cls(text=text, position=position, company=company)
+        return cls(text=_as_text(value))
+
+    def __str__(self) -> str:
+        return self.text
+
+
+@dataclass(slots=True)
+class ResumeProfile:
+    """Canonical resume data shared by the parser, form services and API"""
+    full_name: str = ""
+    email: str = ""
+    phone: str = ""
+    address: str = ""
+    education: list = field(default_factory=list)
+    work_experience: list = field(default_factory=list)
+    skills: list = field(default_factory=list)
+    raw_text: str = ""
+
+    @classmethod
+    def from_dict(cls, data) -> "ResumeProfile":
+        """Normalize any extractor's output (aliased keys, strings or lists) in one step"""
+        if isinstance(data, cls):
+            return data
+        data = data or {}
+
+        skills = _first_value(data, FIELD_ALIASES["skills"])
+        if isinstance(skills, str):
+            skills = SKILL_SPLIT_PATTERN.split(skills)
+
+        return cls(
+            full_name=_as_text(_first_value(data, FIELD_ALIASES["full_name"])),
+            email=_as_text(_first_value(data, FIELD_ALIASES["email"])),
+            phone=_as_text(_first_value(data, FIELD_ALIASES["phone"])),
+            address=_as_text(_first_value(data, FIELD_ALIASES["address"])),
+            education=[EducationEntry.from_value(v) for v in _as_lines(_first_value(data, FIELD_ALIASES["education"]))],
+            work_experience=[ExperienceEntry.from_value(v) for v in _as_lines(_first_value(data, FIELD_ALIASES["work_experience"]))],
+            skills=[s.strip() for s in (_as_text(s) for s in skills or []) if s.strip()],
+            raw_text=data.get("raw_text") or "",
+        )
+
+    def to_dict(self, include_raw: bool = True) -> dict:
+        """Return the API representation, keyed the way the frontend and forms expect"""
+        data = {
+            "Full Name": self.full_name,
+            "Email": self.email,
+            "Phone Number": self.phone,
+            "Address": self.address,
+            "Education": [entry.text for entry in self.education],
+            "Work Experience": [entry.text for entry in self.work_experience],
+            "Skills": list(self.skills),
+        }
+        if include_raw:
+            data["raw_text"] = self.raw_text
+        return data
+
+
+def dumps(obj, indent: bool = False, default=None) -> bytes:
+    """Serialize to JSON bytes, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, default=default, ensure_ascii=False).encode("utf-8")
@@ -0,0 +1,317 @@
+import asyncio
+import hashlib
+import json
+import random
+import sqlite3
+import threading
+import time
+from .config import (
+    OUTBOX_BACKOFF_BASE, OUTBOX_BACKOFF_MAX, OUTBOX_BATCH_SIZE, OUTBOX_DB_PATH, OUTBOX_LEASE_SECONDS,
+    OUTBOX_MAX_ATTEMPTS, OUTBOX_POLL_SECONDS, OUTBOX_RETENTION_SECONDS,
+)
+from .admission import BULK, INTERACTIVE, workload_class
+from .logger import logger, log_error
+from .metrics import OUTBOX_SUBMISSIONS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    key TEXT PRIMARY KEY,
+    form_url TEXT NOT NULL,
+    data TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    status_code INTEGER,
+    error TEXT,
+    created_at REAL NOT NULL,
+    sent_at REAL,
+    workload TEXT
+);
+CREATE INDEX IF NOT EXISTS submissions_due ON submissions (status, next_attempt_at);
+"""
+
+# Resume fields that don't describe the candidate
+_NON_PROFILE_KEYS = ("raw_text", "success", "ats_friendly")
+
+
+def idempotency_key(form_id: str, resume_data: dict) -> str:
+    """Form ID + hash of the parsed profile: the same resume sent to the same form twice gets the same key"""
+    profile = {k: v for k, v in resume_data.items() if k not in _NON_PROFILE_KEYS}
+    digest = hashlib.sha256(json.dumps(profile, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f"{form_id}:{digest[:32]}"
+
+
+def _classify(result) -> tuple:
+    """(outcome, status_code, error) for a `send` result: sent, retry or failed"""
+    if result is True:
+        return "sent", None, None
+    if not isinstance(result, dict):
+        return "retry", None, "Submission returned no result"
+    status_code = result.get("status_code")
+    if status_code is None:
+        # Timeouts and connection errors: Google may or may not have the response
+        return "retry", None, result.get("error") or "Submission failed"
+    if status_code == 429 or status_code >= 500:
+        return "retry", status_code, f"HTTP {status_code}"
+    return "failed", status_code, f"HTTP {status_code}"
+
+
+class SubmissionOutbox:
+    """Durable outbox for Google Forms submissions, stored in sqlite.
+
+    Each submission is recorded under its idempotency key before anything is
+    sent, so a retried request is matched to the earlier one instead of
+    posting the form again, and a submission interrupted by a crash is picked
+    up again once its lease expires. A background task claims due submissions
+    and sends each in its own task with `await send(form_url, data)` (which
+    holds the submit stage limit), up to OUTBOX_BATCH_SIZE at once; outcomes
+    that arrive together are committed in one transaction. Timeouts, 429s and
+    5xx are retried with exponential backoff and full jitter.
+    """
+
+    def __init__(self, send, path: str = OUTBOX_DB_PATH):
+        self.send = send
+        self.path = path
+        self.wakeup = None
+        self.worker = None
+        self.finished = {}
+        self.sending = set()
+        self.outcomes = []
+        self._local = threading.local()
+        self._db().executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        # Databases created before submissions recorded their workload class
+        columns = {row["name"] for row in self._db().execute("PRAGMA table_info(submissions)")}
+        if "workload" not in columns:
+            self._db().execute("ALTER TABLE submissions ADD COLUMN workload TEXT")
+
+    def _db(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets readers proceed during writes
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def depth(self) -> int:
+        return self._db().execute("SELECT COUNT(*) FROM submissions WHERE status IN ('pending', 'sending')").fetchone()[0]
+
+    def _enqueue(self, key: str, form_url: str, data: dict, workload: str) -> tuple:
+        db = self._db()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute("SELECT status FROM submissions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                db.execute(
+                    "INSERT INTO submissions (key, form_url, data, status, next_attempt_at, created_at, workload) "
+                    "VALUES (?, ?, ?, 'pending', ?, ?, ?)",
+                    (key, form_url, json.dumps(data), now, now, workload),
+                )
+                status, duplicate = "pending", False
+            elif row["status"] == "failed":
+                # A rejected submission may succeed once the form or resume changes
+                db.execute(
+                    "UPDATE submissions SET form_url = ?, data = ?, status = 'pending', attempts = 0, next_attempt_at = ?, "
+                    "status_code = NULL, error = NULL, workload = ? WHERE key = ?",
+                    (form_url, json.dumps(data), now, workload, key),
+                )
+                status, duplicate = "pending", False
+            else:
+                status, duplicate = row["status"], True
+            db.execute("COMMIT")
+            return status, duplicate
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    async def enqueue(self, key: str, form_url: str, data: dict) -> tuple:
+        """Record a submission; returns (status, duplicate). Duplicates are not sent again.
+
+        The caller's workload class is stored with it, so a background job's
+        submission is sent as bulk work.
+        """
+        status, duplicate = await asyncio.to_thread(self._enqueue, key, form_url, data, workload_class.get())
+        if duplicate:
+            OUTBOX_SUBMISSIONS.inc("duplicate")
+        elif self.wakeup is not None:
+            self.wakeup.set()
+        return status, duplicate
+
+    def _get(self, key: str):
+        return self._db().execute(
+            "SELECT key, status, attempts, next_attempt_at, status_code, error, created_at, sent_at FROM submissions WHERE key = ?",
+            (key,),
+        ).fetchone()
+
+    async def get(self, key: str) -> dict:
+        """Public view of a submission, or None if it does not exist"""
+        row = await asyncio.to_thread(self._get, key)
+        if row is None:
+            return None
+        submission = {"submission_id": row["key"], "status": row["status"], "attempts": row["attempts"]}
+        if row["status"] == "pending" and row["attempts"]:
+            submission["next_attempt_in_s"] = round(max(0.0, row["next_attempt_at"] - time.time()), 1)
+        if row["status_code"] is not None:
+            submission["status_code"] = row["status_code"]
+        if row["error"]:
+            submission["error"] = row["error"]
+        if row["sent_at"]:
+            submission["sent_at"] = row["sent_at"]
+        return submission
+
+    async def wait(self, key: str, timeout: float) -> dict:
+        """Wait up to `timeout` seconds for a submission to be sent or fail"""
+        deadline = time.monotonic() + timeout
+        while True:
+            submission = await self.get(key)
+            remaining = deadline - time.monotonic()
+            if submission is None or submission["status"] in ("sent", "failed"):
+                self.finished.pop(key, None)
+                return submission
+            if remaining <= 0:
+                return submission
+            # Woken by the local worker; the poll covers workers in other processes
+            event = self.finished.setdefault(key, asyncio.Event())
+            try:
+                await asyncio.wait_for(event.wait(), min(remaining, OUTBOX_POLL_SECONDS))
+            except asyncio.TimeoutError:
+                pass
+
+    def _claim(self, limit: int) -> list:
+        db = self._db()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            # A "sending" row whose lease ran out was abandoned by a dead process
+            db.execute(
+                "UPDATE submissions SET status = 'failed', error = 'Interrupted too many times', data = NULL "
+                "WHERE status = 'sending' AND next_attempt_at <= ? AND attempts >= ?",
+                (now, OUTBOX_MAX_ATTEMPTS),
+            )
+            rows = db.execute(
+                "SELECT key, form_url, data, attempts, workload FROM submissions WHERE status IN ('pending', 'sending') "
+                "AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            db.executemany(
+                "UPDATE submissions SET status = 'sending', attempts = attempts + 1, next_attempt_at = ? WHERE key = ?",
+                [(now + OUTBOX_LEASE_SECONDS, row["key"]) for row in rows],
+            )
+            db.execute("COMMIT")
+            return rows
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def _record(self, outcomes: list):
+        # One transaction for every outcome that arrived since the last commit
+        db = self._db()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            for key, attempts, outcome, status_code, error in outcomes:
+                if outcome == "retry" and attempts < OUTBOX_MAX_ATTEMPTS:
+                    delay = random.uniform(0, min(OUTBOX_BACKOFF_MAX, OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1)))
+                    db.execute(
+                        "UPDATE submissions SET status = 'pending', next_attempt_at = ?, status_code = ?, error = ? WHERE key = ?",
+                        (now + delay, status_code, error, key),
+                    )
+                else:
+                    # The answers are only needed while the submission can still be sent
+                    status = "sent" if outcome == "sent" else "failed"
+                    db.execute(
+                        "UPDATE submissions SET status = ?, status_code = ?, error = ?, sent_at = ?, data = NULL WHERE key = ?",
+                        (status, status_code, error, now if status == "sent" else None, key),
+                    )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def _purge(self) -> int:
+        # Sent keys are kept for OUTBOX_RETENTION_SECONDS, which is the dedupe window
+        return self._db().execute(
+            "DELETE FROM submissions WHERE status IN ('sent', 'failed') AND created_at < ?",
+            (time.time() - OUTBOX_RETENTION_SECONDS,),
+        ).rowcount
+
+    async def start(self):
+        purged = await asyncio.to_thread(self._purge)
+        if purged:
+            logger.info(f"Submission outbox: purged {purged} expired submission(s)")
+        self.wakeup = asyncio.Event()
+        self.worker = asyncio.create_task(self._worker())
+
+    async def stop(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            await asyncio.gather(self.worker, return_exceptions=True)
+            self.worker = None
+        # Interrupted sends are retried once their lease expires
+        sending = list(self.sending)
+        for task in sending:
+            task.cancel()
+        await asyncio.gather(*sending, return_exceptions=True)
+        try:
+            await self._flush()
+        except Exception as e:
+            log_error(f"Submission outbox: recording outcomes on shutdown failed: {e}", "outbox")
+
+    async def _worker(self):
+        while True:
+            # Cleared before claiming so an enqueue or a finished send during
+            # the claim is not missed
+            self.wakeup.clear()
+            try:
+                await self._flush()
+                free = OUTBOX_BATCH_SIZE - len(self.sending)
+                rows = await asyncio.to_thread(self._claim, free) if free > 0 else []
+                for row in rows:
+                    task = asyncio.create_task(self._send_one(row))
+                    self.sending.add(task)
+                    task.add_done_callback(self.sending.discard)
+                if rows:
+                    continue
+            except Exception as e:
+                log_error(f"Submission outbox worker failed: {e}", "outbox")
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), OUTBOX_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _send_one(self, row):
+        # Sent in the enqueuing request's class; retries yield to first
+        # attempts, which a request may be waiting on
+        workload_class.set(BULK if row["attempts"] else row["workload"] or INTERACTIVE)
+        try:
+            result = await self.send(row["form_url"], json.loads(row["data"]))
+        except Exception as e:
+            result = {"ok": False, "error": str(e)}
+        # Recorded by the worker, together with any other outcomes by then
+        self.outcomes.append((row["key"], row["attempts"] + 1, *_classify(result)))
+        self.wakeup.set()
+
+    async def _flush(self):
+        if not self.outcomes:
+            return
+        outcomes = self.outcomes
+        self.outcomes = []
+        try:
+            await asyncio.to_thread(self._record, outcomes)
+        except BaseException:
+            # Kept for the next flush
+            self.outcomes[:0] = outcomes
+            raise
+        for key, attempts, outcome, status_code, error in outcomes:
+            if outcome == "retry" and attempts >= OUTBOX_MAX_ATTEMPTS:
+                outcome = "failed"
+            OUTBOX_SUBMISSIONS.inc(outcome)
+            event = self.finished.pop(key, None)
+            if event is not None:
+                event.set()
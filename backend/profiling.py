@@ -0,0 +1,160 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from .config import ADMIN_TOKEN, PROFILE_DIR, PROFILE_SAMPLE_RATE, PROFILE_TOP_FUNCTIONS
+
+PROFILE_HEADER = "X-Profile"
+
+_active_profile = ContextVar("active_profile", default=None)
+
+# cProfile only sees the thread that enabled it, and only one profiler may run
+# per thread: a single request is profiled at a time, and worker-thread stages
+# get their own profiler that is merged in when the request is saved
+_busy = threading.Lock()
+_thread_state = threading.local()
+
+
+class RequestProfile:
+    """cProfile data for one request, plus worker-thread stages and the tracemalloc peak"""
+
+    def __init__(self, request_id: str, endpoint: str, reason: str):
+        self.request_id = request_id
+        self.endpoint = endpoint
+        self.reason = reason
+        self.owner_thread = threading.get_ident()
+        self.profiler = cProfile.Profile()
+        self.thread_profilers = []
+        self.started = time.perf_counter()
+        self.duration_ms = 0.0
+        self.peak_bytes = 0
+        self.started_tracemalloc = False
+
+    def start(self):
+        self.started_tracemalloc = not tracemalloc.is_tracing()
+        if self.started_tracemalloc:
+            tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            self.profiler.enable()
+        except BaseException:
+            if self.started_tracemalloc:
+                tracemalloc.stop()
+            raise
+
+    def stop(self):
+        self.profiler.disable()
+        self.duration_ms = (time.perf_counter() - self.started) * 1000
+        self.peak_bytes = tracemalloc.get_traced_memory()[1]
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+
+    def stats(self) -> pstats.Stats:
+        stats = pstats.Stats(self.profiler)
+        for profiler in self.thread_profilers:
+            stats.add(profiler)
+        return stats
+
+    def save(self) -> str:
+        """Write <name>.prof (pstats) and <name>.json (summary) to PROFILE_DIR"""
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.request_id}"
+        stats = self.stats()
+        stats.dump_stats(os.path.join(PROFILE_DIR, f"{name}.prof"))
+
+        top = io.StringIO()
+        stats.stream = top
+        stats.sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+        summary = {
+            "name": name,
+            "request_id": self.request_id,
+            "endpoint": self.endpoint,
+            "reason": self.reason,
+            "duration_ms": round(self.duration_ms, 1),
+            "tracemalloc_peak_bytes": self.peak_bytes,
+            "top_functions": top.getvalue(),
+        }
+        with open(os.path.join(PROFILE_DIR, f"{name}.json"), "w") as f:
+            json.dump(summary, f)
+        return name
+
+
+def should_profile(header_value: str) -> str:
+    """Return why this request should be profiled, or None"""
+    if ADMIN_TOKEN and header_value == ADMIN_TOKEN:
+        return "header"
+    if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+        return "sampled"
+    return None
+
+
+def begin_profile(request_id: str, endpoint: str, reason: str):
+    """Start profiling the current request; returns None if another profile is running
+    or profiling could not start"""
+    if not _busy.acquire(blocking=False):
+        return None
+    profile = RequestProfile(request_id, endpoint, reason)
+    _active_profile.set(profile)
+    try:
+        profile.start()
+    except Exception as e:
+        # e.g. another profiler (a debugger, coverage) already owns this thread
+        _active_profile.set(None)
+        _busy.release()
+        from .logger import log_error  # .logger imports this module via .tracing
+        log_error(f"Could not start profiling {endpoint}: {e}", "profiling")
+        return None
+    return profile
+
+
+def end_profile(profile: RequestProfile):
+    profile.stop()
+    _active_profile.set(None)
+    _busy.release()
+
+
+@contextmanager
+def thread_profile():
+    """Profile a stage running in a worker thread as part of the active request profile"""
+    profile = _active_profile.get()
+    if profile is None or threading.get_ident() == profile.owner_thread or getattr(_thread_state, "profiling", False):
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    _thread_state.profiling = True
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _thread_state.profiling = False
+        profile.thread_profilers.append(profiler)
+
+
+def list_profiles() -> list:
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    summaries = []
+    for filename in sorted(os.listdir(PROFILE_DIR), reverse=True):
+        if filename.endswith(".json"):
+            with open(os.path.join(PROFILE_DIR, filename)) as f:
+                summary = json.load(f)
+            summary.pop("top_functions", None)
+            summaries.append(summary)
+    return summaries
+
+
+def profile_path(name: str, extension: str) -> str:
+    """Path of a stored profile file, or None if the name is unknown or unsafe"""
+    if os.path.basename(name) != name or name.startswith("."):
+        return None
+    path = os.path.join(PROFILE_DIR, f"{name}.{extension}")
+    return path if os.path.isfile(path) else None
@@ -7,7 +7,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import json
 import time
+from ..config import OPENROUTER_API_BASE
 from ..logger import log_form_fields, log_error
+from ..metrics import outbound
 from llama_index.llms.openrouter import OpenRouter
 
 class FormAnalyzer:
@@ -20,6 +22,7 @@ class FormAnalyzer:
         if self.openrouter_key:
             self.llm = OpenRouter(
                 api_key=self.openrouter_key,
+                api_base=OPENROUTER_API_BASE,
                 model="mistralai/mistral-7b-instruct:free",
                 max_tokens=500,
                 temperature=0.1
@@ -153,7 +156,8 @@ Return JSON with field mappings.
 """
         
         try:
-            response = await self.llm.acomplete(prompt)
+            with outbound("openrouter"):
+                response = await self.llm.acomplete(prompt)
             content = str(response)
             
             # Clean and parse JSON
@@ -8,7 +8,11 @@ import time
 import re
 import json
 import os
+from ..config import OPENROUTER_API_BASE
 from ..logger import log_error
+from ..models import EducationEntry, ExperienceEntry, ResumeProfile, dumps
+from ..tracing import traced
+from ..metrics import outbound
 from llama_index.llms.openrouter import OpenRouter
 
 class FormFiller:
@@ -22,11 +26,13 @@ class FormFiller:
         if self.openrouter_key:
             self.llm = OpenRouter(
                 api_key=self.openrouter_key,
+                api_base=OPENROUTER_API_BASE,
                 model="mistralai/mistral-7b-instruct:free",
                 max_tokens=1000,
                 temperature=0.1
             )
     
+    @traced("selenium_fill")
     async def fill_form(self, form_url: str, resume_data: dict, form_fields: dict) -> dict:
         try:
             self._setup_driver()
@@ -228,12 +234,12 @@ class FormFiller:
     
     def _format_education(self, education: list) -> str:
         if isinstance(education, list) and education:
-            return "; ".join([f"{edu.get('degree', '')} from {edu.get('institution', '')}" for edu in education])
+            return "; ".join(EducationEntry.from_value(edu).text for edu in education)
         return str(education) if education else ''
     
     def _format_experience(self, experience: list) -> str:
         if isinstance(experience, list) and experience:
-            return "; ".join([f"{exp.get('position', '')} at {exp.get('company', '')}" for exp in experience])
+            return "; ".join(ExperienceEntry.from_value(exp).text for exp in experience)
         return str(experience) if experience else ''
     
     def _format_skills(self, skills: list) -> str:
@@ -408,6 +414,7 @@ class FormFiller:
         
         return mappings
     
+    @traced("llm")
     async def _get_ai_field_mappings(self, field_contexts: list, resume_data: dict, form_fields: dict) -> list:
         """Use AI to intelligently map form fields to resume data"""
         try:
@@ -431,7 +438,7 @@ class FormFiller:
 You are an AI assistant that maps form fields to resume data. 
 
 Resume Data:
-{json.dumps(resume_data, indent=2)}
+{dumps(ResumeProfile.from_dict(resume_data).to_dict(include_raw=False), indent=True).decode()}
 
 Form Fields:
 {json.dumps(fields_info, indent=2)}
@@ -461,7 +468,8 @@ Rules:
                 return self._fallback_field_mapping(field_contexts, resume_data)
             
             try:
-                response = await self.llm.acomplete(prompt)
+                with outbound("openrouter"):
+                    response = await self.llm.acomplete(prompt)
                 content = str(response)
                 
                 # Clean and parse JSON
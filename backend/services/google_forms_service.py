@@ -1,30 +1,61 @@
 import os
+import asyncio
 import json
 import requests
 import re
 from urllib.parse import quote
+from requests.adapters import HTTPAdapter
+from ..config import OPENROUTER_API_BASE, OUTBOX_WAIT_SECONDS, SUBMIT_CONCURRENCY
 from ..logger import log_error
-from llama_index.llms.openrouter import OpenRouter
+from ..models import ResumeProfile
+from ..outbox import idempotency_key
+from ..tracing import span, traced
+from ..metrics import outbound
+from ..admission import SUBMIT_LIMIT, Overloaded
+from ..deadline import Deadline, DeadlineExceeded
+
+# Default HTTP timeouts in seconds, shortened to fit a request's deadline
+FORM_FETCH_TIMEOUT = 10
+FORM_SUBMIT_TIMEOUT = 15
+
+# Connection pool shared by all requests to Google, so TLS connections are reused
+_ADAPTER = HTTPAdapter(pool_maxsize=max(10, SUBMIT_CONCURRENCY))
+
+def _session() -> requests.Session:
+    """A session with its own cookies on the shared connection pool (never close it; that closes the pool)"""
+    session = requests.Session()
+    session.mount("https://", _ADAPTER)
+    session.mount("http://", _ADAPTER)
+    return session
+
+def warm_up(url: str, timeout: float = FORM_FETCH_TIMEOUT) -> int:
+    """Open a pooled connection to the Google Forms host; returns the HTTP status"""
+    return _session().head(url, timeout=timeout).status_code
 
 class GoogleFormsService:
     ALL_DATA_FIELDS = "FB_PUBLIC_LOAD_DATA_"
     
-    def __init__(self):
+    def __init__(self, outbox=None):
+        # Submissions go through the SubmissionOutbox when one is given
+        self.outbox = outbox
         self.openrouter_key = os.getenv("OPENROUTER_API_KEY")
-        # Ensure llm attribute exists even if API key missing
-        self.llm = None
+        self._llm = None
         self.form_data = None
         self.entries = None
-        
-        # Initialize OpenRouter LLM for field mapping
-        if self.openrouter_key:
-            self.llm = OpenRouter(
+
+    @property
+    def llm(self):
+        """OpenRouter LLM for field mapping, built on first use (None without an API key)"""
+        if self._llm is None and self.openrouter_key:
+            from llama_index.llms.openrouter import OpenRouter
+            self._llm = OpenRouter(
                 api_key=self.openrouter_key,
+                api_base=OPENROUTER_API_BASE,
                 model="mistralai/mistral-7b-instruct:free",
                 max_tokens=1000,
                 temperature=0.1
             )
-        
+        return self._llm
 
     
     def extract_form_id(self, form_url: str) -> str:
@@ -59,48 +90,95 @@ class GoogleFormsService:
             {"type": "text", "label": "Education"}
         ]
     
-    async def submit_form_response(self, form_url: str, resume_data: dict) -> dict:
-        """Submit form response using reference repo approach"""
+    async def submit_form_response(self, form_url: str, resume_data: dict, progress=None, deadline: Deadline = None) -> dict:
+        """Submit form response using reference repo approach.
+
+        `progress(stage, data)`, if given, is called after the form schema is
+        fetched, the fields are mapped and the form is submitted. HTTP timeouts
+        are shortened to fit the `deadline`; with the outbox, a submission that
+        can't finish in time is left to the background worker.
+        """
+        deadline = deadline or Deadline()
         try:
-            # Parse form entries from the URL
-            entries = self._parse_form_entries(form_url)
+            # Parse form entries from the URL; the HTTP calls run in a worker
+            # thread so they don't block the event loop
+            deadline.check("form_fetch")
+            entries = await asyncio.to_thread(self._parse_form_entries, form_url, deadline.timeout(FORM_FETCH_TIMEOUT))
             if not entries:
                 return {"success": False, "error": "Could not parse form entries"}
+            if progress:
+                progress("form_schema", {
+                    "count": len(entries),
+                    "fields": [{"name": e["name"], "type": e["type"], "required": e["required"]} for e in entries],
+                })
             
             # Fill entries with resume data
             filled_data = self._fill_entries_with_resume_data(entries, resume_data)
+            filled_fields = [f"{k}: {str(v)[:200]}" for k, v in filled_data.items()]
+            if progress:
+                progress("mapped", {"filled_fields": filled_fields})
             
             # Submit the form
-            submit_result = self._submit_form(form_url, filled_data)
+            if self.outbox is not None:
+                submit_result = await self._submit_via_outbox(form_url, resume_data, filled_data, deadline)
+            else:
+                deadline.check("form_submit")
+                submit_result = await self.send_submission(form_url, filled_data, deadline.timeout(FORM_SUBMIT_TIMEOUT))
 
             # If _submit_form returns a dict with details, merge it into response
             if isinstance(submit_result, dict):
                 submit_ok = submit_result.get('ok', False)
             else:
                 submit_ok = bool(submit_result)
+            if progress:
+                progress("submitted", {"success": submit_ok})
 
             response = {
                 "success": submit_ok,
-                "filled_fields": [f"{k}: {str(v)[:200]}" for k, v in filled_data.items()],
+                "filled_fields": filled_fields,
                 "filled_data": filled_data
             }
 
-            if submit_ok:
+            if submit_ok and isinstance(submit_result, dict) and submit_result.get('duplicate'):
+                response["message"] = "This resume was already submitted to this form; it was not sent again"
+            elif submit_ok:
                 response["message"] = f"Form submitted successfully with {len(filled_data)} fields"
+            elif isinstance(submit_result, dict) and submit_result.get('submission_status') in ('pending', 'sending'):
+                response["error"] = "Form submission is still being retried"
             else:
-                # attach submit_result details for debugging
                 response["error"] = "Form submission failed"
-                if isinstance(submit_result, dict):
-                    response.update({k: submit_result[k] for k in submit_result if k not in response})
+            # attach submit_result details (outbox status, or failure details for debugging)
+            if isinstance(submit_result, dict):
+                response.update({k: submit_result[k] for k in submit_result if k not in response and k != 'ok'})
 
             return response
                     
+        except (Overloaded, DeadlineExceeded):
+            raise
         except Exception as e:
+            # A request timeout cut short by the deadline is a deadline failure
+            deadline.check("google_forms")
             log_error(f"Form submission failed: {e}", "google-forms")
             return {"success": False, "error": str(e)}
     
 
     
+    async def _submit_via_outbox(self, form_url: str, resume_data: dict, filled_data: dict, deadline: Deadline) -> dict:
+        """Record the submission in the outbox and wait for the worker to send it"""
+        key = idempotency_key(self.extract_form_id(form_url) or form_url, resume_data)
+        # The POST runs in the outbox worker, outside this request's trace
+        with span("form_submit"):
+            status, duplicate = await self.outbox.enqueue(key, form_url, filled_data)
+            submission = await self.outbox.wait(key, deadline.timeout(OUTBOX_WAIT_SECONDS)) if status != "sent" else {"status": "sent"}
+        result = {"ok": submission["status"] == "sent", "submission_id": key, "submission_status": submission["status"]}
+        if duplicate:
+            result["duplicate"] = True
+        if submission.get("status_code") is not None:
+            result["status_code"] = submission["status_code"]
+        if submission["status"] != "sent" and submission.get("error"):
+            result["submission_error"] = submission["error"]
+        return result
+
     def _get_form_response_url(self, url: str) -> str:
         """Convert form URL to form response URL"""
         url = url.replace('/viewform', '/formResponse')
@@ -162,17 +240,19 @@ class GoogleFormsService:
 
         return None
     
-    def _get_fb_public_load_data(self, url: str):
+    @traced("form_fetch")
+    def _get_fb_public_load_data(self, url: str, timeout: float = FORM_FETCH_TIMEOUT):
         """Get form data from a Google form URL"""
-        response = requests.get(url, timeout=10)
+        with outbound("google_forms"):
+            response = _session().get(url, timeout=timeout)
         if response.status_code != 200:
             log_error(f"Can't get form data: {response.status_code}", "google-forms")
             return None
         return self._extract_script_variables(self.ALL_DATA_FIELDS, response.text)
     
-    def _parse_form_entries(self, url: str):
+    def _parse_form_entries(self, url: str, timeout: float = FORM_FETCH_TIMEOUT):
         """Parse the form entries and return a list of entries"""
-        self.form_data = self._get_fb_public_load_data(url)
+        self.form_data = self._get_fb_public_load_data(url, timeout)
         
         if not self.form_data or not self.form_data[1] or not self.form_data[1][1]:
             log_error("Can't get form entries", "google-forms")
@@ -196,24 +276,17 @@ class GoogleFormsService:
         
         return parsed_entries
     
+    @traced("field_mapping")
     def _fill_entries_with_resume_data(self, entries, resume_data):
         """Map resume fields to Google Form entry IDs using label heuristics.
 
-        Tries multiple candidate keys and falls back to raw_text snippets when
-        a direct mapping isn't found. Returns a dict suitable for posting to
+        Reads the normalized ResumeProfile and falls back to raw_text snippets
+        when a direct mapping isn't found. Returns a dict suitable for posting to
         the Google Forms `formResponse` endpoint: keys like `entry.12345`.
         """
-        def get_value(candidates):
-            for k in candidates:
-                if not k:
-                    continue
-                v = resume_data.get(k)
-                if v:
-                    return v
-            return ''
-
+        profile = ResumeProfile.from_dict(resume_data)
         filled_data = {}
-        raw_text = resume_data.get('raw_text', '') or ''
+        raw_text = profile.raw_text
 
         for entry in entries:
             entry_id = f"entry.{entry['id']}"
@@ -221,31 +294,19 @@ class GoogleFormsService:
             value = ''
 
             if any(word in entry_name for word in ['name', 'full name']):
-                value = get_value(['Full Name', 'name'])
+                value = profile.full_name
             elif any(word in entry_name for word in ['email', 'mail']):
-                value = get_value(['Email', 'email'])
+                value = profile.email
             elif any(word in entry_name for word in ['phone', 'mobile', 'contact']):
-                value = get_value(['Phone Number', 'Phone', 'phone'])
+                value = profile.phone
             elif any(word in entry_name for word in ['address', 'location']):
-                value = get_value(['Address', 'address'])
+                value = profile.address
             elif any(word in entry_name for word in ['skill', 'technology']):
-                skills = get_value(['Skills', 'skills'])
-                if isinstance(skills, list):
-                    value = ', '.join(skills)
-                else:
-                    value = skills
+                value = ', '.join(profile.skills)
             elif any(word in entry_name for word in ['education', 'degree', 'university', 'college']):
-                edu = get_value(['Education', 'education'])
-                if isinstance(edu, list):
-                    value = '; '.join(edu)
-                else:
-                    value = edu
+                value = '; '.join(item.text for item in profile.education)
             elif any(word in entry_name for word in ['experience', 'work', 'job', 'company', 'role', 'position']):
-                exp = get_value(['Work Experience', 'work_experience', 'experience'])
-                if isinstance(exp, list):
-                    value = '; '.join(exp)
-                else:
-                    value = exp
+                value = '; '.join(item.text for item in profile.work_experience)
             else:
                 # Try direct keys that match the label
                 cand = resume_data.get(entry.get('name')) or resume_data.get(entry.get('name').title()) if entry.get('name') else None
@@ -269,14 +330,25 @@ class GoogleFormsService:
 
         return filled_data
     
-    def _submit_form(self, url: str, data: dict) -> bool:
+    async def send_submission(self, url: str, data: dict, timeout: float = FORM_SUBMIT_TIMEOUT):
+        """_submit_form in a worker thread once a submit slot is free.
+
+        The slot is waited for on the event loop, so a queue of submissions
+        doesn't tie up worker threads.
+        """
+        async with SUBMIT_LIMIT.hold():
+            return await asyncio.to_thread(self._submit_form, url, data, timeout)
+
+    @traced("form_submit")
+    def _submit_form(self, url: str, data: dict, timeout: float = FORM_SUBMIT_TIMEOUT) -> bool:
         """Submit the form with data"""
         submit_url = self._get_form_response_url(url)
         try:
             # Use a session and include a Referer header — some forms validate it
-            session = requests.Session()
+            session = _session()
             headers = {"Referer": url, "User-Agent": "Mozilla/5.0 (compatible)"}
-            response = session.post(submit_url, data=data, headers=headers, timeout=15, allow_redirects=True)
+            with outbound("google_forms"):
+                response = session.post(submit_url, data=data, headers=headers, timeout=timeout, allow_redirects=True)
 
             # Treat 200 and 302 (redirect) as success; otherwise return details
             if response.status_code in (200, 302):
@@ -1,83 +1,237 @@
 import os
 import asyncio
+import functools
 import json
 from PyPDF2 import PdfReader
-from docx import Document
+from xml.etree import ElementTree
+import zipfile
 import io
+import mmap
+import re
+import tempfile
+import time
+from ..config import (
+    ATS_CHECK_MAX_PAGES, DEADLINE_RESERVE_SECONDS, EXTRACTION_POLICY, EXTRACTION_POLICIES, LLAMAPARSE_MIN_SECONDS,
+    LLM_MIN_SECONDS, OPENROUTER_API_BASE, PDF_MAX_PAGES, PDF_MAX_CHARS,
+)
 from ..logger import log_resume_data, log_error
+from ..models import ResumeProfile
+from ..tracing import span, traced
+from ..metrics import outbound
+from ..admission import LLM_LIMIT, OCR_LIMIT, Overloaded
+from ..deadline import Deadline, DeadlineExceeded
 
-# OCR libraries
-try:
-    from pdf2image import convert_from_bytes
-    import pytesseract
+# The OCR and LlamaIndex libraries are slow to import, so they are imported on
+# first use rather than when the app starts
+_ocr_modules = None
+
+
+def load_ocr():
+    """(convert_from_bytes, pytesseract), or None if the OCR libraries are not installed"""
+    global _ocr_modules
+    if _ocr_modules is None:
+        try:
+            from pdf2image import convert_from_bytes
+            import pytesseract
+            # Set Tesseract path for Windows
+            tesseract_path = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+            if os.path.exists(tesseract_path):
+                pytesseract.pytesseract.tesseract_cmd = tesseract_path
+            _ocr_modules = (convert_from_bytes, pytesseract)
+        except ImportError:
+            _ocr_modules = ()
+    return _ocr_modules or None
+
+ATS_SUGGESTIONS = [
+    "Export your resume as a 'text-based PDF' from your word processor",
+    "Use File > Save As > PDF (not Print to PDF)",
+    "Upload a DOCX file instead",
+    "Avoid using images or special fonts",
+    "Test your PDF: Can you select and copy text from it? If not, it's not ATS-friendly"
+]
+
+# PDF content-stream operators that draw text: Tj, TJ, ' and "
+TEXT_OPERATOR_PATTERN = re.compile(rb"(?:\bT[Jj]|(?<=[\s)>\]])['\"])(?![^\s\[\]()<>/%])")
+
+# WordprocessingML tags read by the DOCX extractor
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_P, W_T, W_TAB, W_BR, W_CR = (W_NS + t for t in ("p", "t", "tab", "br", "cr"))
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+# Section headings the deterministic extractor looks for; once all have been
+# seen, later PDF pages are not read. A heading line is up to two qualifier
+# words, the section name, then either a colon or nothing else.
+REQUIRED_SECTIONS = ("skills", "education", "experience")
+SECTION_HEADING_PATTERN = re.compile(r"^[ \t]*((?:[A-Za-z&]+[ \t]+){0,2}?)(skills|education|experience)\b[ \t]*(:?)[ \t]*(.*)$", re.I | re.M)
+MAX_HEADING_LENGTH = 80
+
+# Field patterns for the deterministic extractor, written so no position is
+# rescanned (the old \+?\d[\d\-(). ]{6,}\d backtracked on long digit runs)
+EMAIL_LOCAL_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.+-")
+EMAIL_DOMAIN_PATTERN = re.compile(r"[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+PHONE_RUN_PATTERN = re.compile(r"\+?\d[\d\-(). ]*")
+SKILL_SEPARATOR_PATTERN = re.compile(r"[;,]")
+
+# Earlier versions copied each upload to a NamedTemporaryFile for LlamaParse
+# (default tmpXXXXXXXX name, upload's extension) and leaked it when parsing
+# raised; files with that name are reaped at startup
+LEAKED_UPLOAD_PATTERN = re.compile(r"tmp[a-z0-9_]{8}\.(?:pdf|docx|txt)")
+
+def reap_stale_uploads(max_age_seconds: int = 3600) -> int:
+    """Delete upload copies leaked by earlier versions; returns the count"""
+    removed = 0
+    cutoff = time.time() - max_age_seconds
+    tmp_dir = tempfile.gettempdir()
+    for name in os.listdir(tmp_dir):
+        if not LEAKED_UPLOAD_PATTERN.fullmatch(name):
+            continue
+        path = os.path.join(tmp_dir, name)
+        try:
+            if os.path.isfile(path) and os.path.getmtime(path) < cutoff:
+                os.unlink(path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+@functools.lru_cache(maxsize=None)
+def shared_llm(api_key: str):
+    """OpenRouter LLM shared by every ResumeParser, so its HTTP connections are reused"""
+    from llama_index.llms.openrouter import OpenRouter
+    return OpenRouter(
+        api_key=api_key,
+        api_base=OPENROUTER_API_BASE,
+        model="mistralai/mistral-7b-instruct:free",
+        max_tokens=1500,
+        temperature=0.0
+    )
+
+@functools.lru_cache(maxsize=None)
+def shared_llama_parse(api_key: str):
+    from llama_parse import LlamaParse
+    return LlamaParse(
+        api_key=api_key,
+        result_type="text",
+        parsing_instruction="Extract structured information including name, email, phone, address, education, work experience, and skills from this resume document."
+    )
+
+def warm_ocr() -> bool:
+    """Run tesseract once on a blank page so its binary and language data are cached; False without OCR"""
+    ocr = load_ocr()
+    if not ocr:
+        return False
     from PIL import Image
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
+    ocr[1].image_to_string(Image.new("L", (200, 50), 255), lang="eng")
+    return True
 
-# Official LlamaIndex libraries
-from llama_index.llms.openrouter import OpenRouter
-from llama_parse import LlamaParse
-from llama_index.core import Document as LlamaDocument
+async def read_in_thread(func, *args):
+    """asyncio.to_thread for stages that read the upload buffer.
+
+    If cancelled, waits for the thread to return before re-raising, so the
+    caller can't close a memory-mapped upload while the thread still reads
+    it. Cancel the deadline passed to the stage to make that wait short.
+    """
+    future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await asyncio.wait([future])
+        if not future.cancelled():
+            # The result no longer matters; mark any exception as retrieved
+            future.exception()
+        raise
 
 class ResumeParser:
     def __init__(self):
         self.openrouter_key = os.getenv("OPENROUTER_API_KEY")
         self.llama_key = os.getenv("LLAMA_CLOUD_API_KEY")
-        # Ensure attributes exist even if API keys are missing
-        self.llm = None
-        self.parser = None
-        
-        # Initialize OpenRouter LLM
-        if self.openrouter_key:
-            self.llm = OpenRouter(
-                api_key=self.openrouter_key,
-                model="mistralai/mistral-7b-instruct:free",
-                max_tokens=1500,
-                temperature=0.0
-            )
-        
-        # Initialize LlamaParse
-        if self.llama_key:
-            self.parser = LlamaParse(
-                api_key=self.llama_key,
-                result_type="text",
-                parsing_instruction="Extract structured information including name, email, phone, address, education, work experience, and skills from this resume document."
-            )
+        # Clients are built once per process and shared (see shared_llm)
+        self.llm = shared_llm(self.openrouter_key) if self.openrouter_key else None
+        self.parser = shared_llama_parse(self.llama_key) if self.llama_key else None
     
-    async def extract_data(self, content: bytes, filename: str) -> dict:
+    @traced("parse")
+    async def extract_data(self, content: bytes, filename: str, policy: str = None, deadline: Deadline = None) -> dict:
+        """Extract structured resume data.
+
+        `policy` selects the strategy: "quality" tries LlamaParse first and
+        falls back to local extraction; "fastest" races both and returns the
+        first valid result. Defaults to EXTRACTION_POLICY.
+
+        With a `deadline`, LlamaParse and the LLM are skipped or cut short in
+        favour of local extraction when time runs low.
+        """
+        deadline = deadline or Deadline()
+        policy = policy if policy in EXTRACTION_POLICIES else EXTRACTION_POLICY
+        if policy == "fastest" and self.parser:
+            return self._normalize_result(await self._race_extraction(content, filename, deadline))
+
         # Try Llama Cloud first with original file
-        llama_result = await self._try_llama_cloud(content, filename)
+        llama_result = await self._try_llama_cloud_within(content, filename, deadline)
         if llama_result:
-            return llama_result
+            return self._normalize_result(llama_result)
 
         # Fallback to text extraction + heuristic parser
-        text = self._extract_text(content, filename)
+        return self._normalize_result(await self._extract_local(content, filename, deadline))
+
+    async def _try_llama_cloud_within(self, content: bytes, filename: str, deadline: Deadline) -> dict:
+        """LlamaParse, if there is time for it; None sends the caller to local extraction"""
+        if self.parser and not deadline.has(LLAMAPARSE_MIN_SECONDS + DEADLINE_RESERVE_SECONDS):
+            log_error(f"Skipping LlamaParse: {deadline.remaining():.1f}s left", "resume-parser")
+            return None
+        try:
+            return await deadline.run(self._try_llama_cloud(content, filename), "llamaparse", reserve=DEADLINE_RESERVE_SECONDS)
+        except DeadlineExceeded:
+            # Only the reserve is left (or the client is gone): local extraction or give up
+            deadline.check("llamaparse")
+            log_error("LlamaParse ran out of time - using local extraction", "resume-parser")
+            return None
+
+    def _normalize_result(self, result: dict) -> dict:
+        """Map any extractor's output onto the canonical ResumeProfile shape"""
+        if not result.get('ats_friendly', True):
+            return result
+        data = ResumeProfile.from_dict(result).to_dict()
+        data['success'] = result.get('success', True)
+        data['ats_friendly'] = True
+        return data
+
+    async def _race_extraction(self, content: bytes, filename: str, deadline: Deadline) -> dict:
+        """Run LlamaParse and local extraction concurrently; first valid result wins"""
+        # The loser's deadline is cancelled so its worker thread stops at the next check
+        local_deadline = deadline.child()
+        local_task = asyncio.create_task(self._extract_local(content, filename, local_deadline))
+        llama_task = asyncio.create_task(self._try_llama_cloud_within(content, filename, deadline))
+        pending = {local_task, llama_task}
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result and self._validate_parsed_data(result):
+                        return result
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                local_deadline.cancel()
+                # Don't return (and let the caller close the upload) while a thread still reads it
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        # Neither result was valid; the local one carries the ATS verdict
+        return local_task.result() or llama_task.result()
+
+    async def _extract_local(self, content: bytes, filename: str, deadline: Deadline) -> dict:
+        """Local text extraction followed by the deterministic field extractor"""
+        text = await read_in_thread(self._extract_text, content, filename, deadline)
+        if filename.endswith('.pdf') and not text.strip():
+            log_error("PDF text extraction returned empty - attempting OCR", "resume-parser")
+            text = await self._ocr_fallback(content, deadline)
 
         # Check if we got any text at all - PDF must be ATS-friendly
         if not text or not text.strip():
             log_error("PDF is not ATS-friendly - no text extracted", "resume-parser")
-            return {
-                "success": False,
-                "ats_friendly": False,
-                "error": "This PDF is NOT ATS-friendly",
-                "message": "Your resume appears to be a scanned image or uses formatting that prevents text extraction. ATS (Applicant Tracking Systems) cannot read this type of PDF.",
-                "suggestions": [
-                    "Export your resume as a 'text-based PDF' from your word processor",
-                    "Use File > Save As > PDF (not Print to PDF)",
-                    "Upload a DOCX file instead",
-                    "Avoid using images or special fonts",
-                    "Test your PDF: Can you select and copy text from it? If not, it's not ATS-friendly"
-                ],
-                "Full Name": "",
-                "Email": "",
-                "Phone Number": "",
-                "Address": "",
-                "Education": [],
-                "Work Experience": [],
-                "Skills": [],
-                "raw_text": ""
-            }
+            return self._get_ats_failure_data()
 
         # First try a deterministic extractor on the text — prefer exact matches
         basic = self._extract_basic_fields(text)
@@ -91,13 +245,17 @@ class ResumeParser:
             log_resume_data(basic)
             return basic
 
-        # Try AI parsing if deterministic extractor didn't find enough
-        if self.llm:
+        # Try AI parsing if deterministic extractor didn't find enough (and there is time)
+        if self.llm and deadline.has(LLM_MIN_SECONDS + DEADLINE_RESERVE_SECONDS):
             try:
-                ai_result = await self._parse_with_ai(text)
+                ai_result = await deadline.run(self._parse_with_ai(text), "llm", reserve=DEADLINE_RESERVE_SECONDS)
                 # If AI produced a valid dict with meaningful fields, return it
                 if isinstance(ai_result, dict) and ai_result.get('Full Name'):
                     return ai_result
+            except Overloaded:
+                raise
+            except DeadlineExceeded:
+                deadline.check("llm")
             except Exception:
                 # fall through to deterministic extractor
                 pass
@@ -108,59 +266,210 @@ class ResumeParser:
         log_resume_data(basic)
         return basic
     
-    def _extract_text(self, content: bytes, filename: str) -> str:
+    def _get_ats_failure_data(self) -> dict:
+        """Return the payload used when a PDF is not ATS-friendly"""
+        return {
+            "success": False,
+            "ats_friendly": False,
+            "error": "This PDF is NOT ATS-friendly",
+            "message": "Your resume appears to be a scanned image or uses formatting that prevents text extraction. ATS (Applicant Tracking Systems) cannot read this type of PDF.",
+            "suggestions": list(ATS_SUGGESTIONS),
+            "Full Name": "",
+            "Email": "",
+            "Phone Number": "",
+            "Address": "",
+            "Education": [],
+            "Work Experience": [],
+            "Skills": [],
+            "raw_text": ""
+        }
+
+    @traced("ats_check")
+    def check_ats_readiness(self, content: bytes, filename: str) -> dict:
+        """Quick ATS check that inspects PDF structure without OCR or network calls.
+
+        Looks at fonts, text-drawing operators and image XObjects on the first
+        few pages, including the form XObjects they draw. DOCX and TXT uploads are text-based and always pass.
+        """
+        if not filename.endswith('.pdf'):
+            return {"ats_friendly": True, "reasons": [], "suggestions": [], "pages_checked": 0}
+
+        reasons = []
+        pages_checked = 0
+        text_pages = 0
+        try:
+            reader = PdfReader(self._open_stream(content))
+            if reader.is_encrypted:
+                reasons.append("PDF is encrypted, so ATS systems cannot read its text")
+            else:
+                for i, page in enumerate(reader.pages[:ATS_CHECK_MAX_PAGES]):
+                    pages_checked += 1
+                    has_fonts, has_images, has_text_ops = self._inspect_page(page)
+
+                    if has_text_ops and has_fonts:
+                        text_pages += 1
+                    elif has_images:
+                        reasons.append(f"Page {i + 1} contains only images (looks like a scan)")
+                    elif not has_fonts:
+                        reasons.append(f"Page {i + 1} has no fonts, so its text is likely drawn as vector shapes")
+                    else:
+                        reasons.append(f"Page {i + 1} has no selectable text")
+        except Exception as e:
+            log_error(f"ATS pre-check error: {e}", "resume-parser")
+            reasons.append("PDF structure could not be read")
+
+        ats_friendly = text_pages > 0
+        if not ats_friendly and not reasons:
+            reasons.append("No pages with selectable text were found")
+
+        return {
+            "ats_friendly": ats_friendly,
+            "reasons": reasons,
+            "suggestions": [] if ats_friendly else list(ATS_SUGGESTIONS),
+            "pages_checked": pages_checked
+        }
+
+    def _inspect_page(self, page) -> tuple:
+        """Return (has_fonts, has_images, has_text_ops) for a PDF page"""
+        contents = page.get_contents()
+        data = contents.get_data() if contents is not None else b""
+        return self._inspect_content(data, page.get("/Resources"), set())
+
+    def _inspect_content(self, data: bytes, resources, seen: set) -> tuple:
+        """(has_fonts, has_images, has_text_ops) for a content stream and its resources.
+
+        Form XObjects (templates and exported layouts often draw all their
+        text from one) are inspected as part of the content that uses them;
+        `seen` stops reference cycles.
+        """
+        has_text_ops = bool(TEXT_OPERATOR_PATTERN.search(data))
+        if resources is None:
+            return False, False, has_text_ops
+        resources = resources.get_object()
+
+        has_fonts = bool(resources.get("/Font"))
+        has_images = False
+        xobjects = resources.get("/XObject")
+        for xobj in (xobjects.get_object().values() if xobjects else ()):
+            xobj = xobj.get_object()
+            subtype = xobj.get("/Subtype")
+            if subtype == "/Image":
+                has_images = True
+            elif subtype == "/Form" and id(xobj) not in seen:
+                seen.add(id(xobj))
+                fonts, images, text_ops = self._inspect_content(xobj.get_data(), xobj.get("/Resources"), seen)
+                has_fonts, has_images, has_text_ops = has_fonts or fonts, has_images or images, has_text_ops or text_ops
+        return has_fonts, has_images, has_text_ops
+
+    def _open_stream(self, content):
+        """Return a readable binary stream over bytes or a memory-mapped upload"""
+        if isinstance(content, mmap.mmap):
+            # Read straight from the mapped spool file instead of copying it
+            content.seek(0)
+            return content
+        return io.BytesIO(content)
+
+    def _as_bytes(self, content) -> bytes:
+        """Materialize a memory-mapped upload for consumers that need real bytes"""
+        if isinstance(content, mmap.mmap):
+            return content[:]
+        return content
+
+    def _extract_text(self, content: bytes, filename: str, deadline: Deadline = None) -> str:
         if filename.endswith('.pdf'):
-            return self._extract_pdf_text(content)
+            return self._extract_pdf_text(content, deadline)
         elif filename.endswith('.docx'):
             return self._extract_docx_text(content)
         else:
-            return content.decode('utf-8')
+            return self._as_bytes(content).decode('utf-8')
     
-    def _extract_pdf_text(self, content: bytes) -> str:
+    @traced("pdf_text")
+    def _extract_pdf_text(self, content: bytes, deadline: Deadline = None) -> str:
+        """Text layer of a PDF; "" for scans and unreadable files, which go to _ocr_fallback"""
         try:
-            reader = PdfReader(io.BytesIO(content))
-            text = ""
-            for page in reader.pages:
-                extracted = page.extract_text()
-                if extracted:
-                    text += extracted + "\n"
-            
-            # If no text was extracted, try OCR as fallback
-            if not text.strip():
-                log_error("PDF text extraction returned empty - attempting OCR", "resume-parser")
-                text = self._extract_pdf_text_with_ocr(content)
-            
-            return text
+            reader = PdfReader(self._open_stream(content))
+            return ''.join(self._iter_pdf_pages(reader, deadline))
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             log_error(f"PDF extraction error: {e}", "resume-parser")
-            # Try OCR as last resort
-            try:
-                return self._extract_pdf_text_with_ocr(content)
-            except Exception:
-                return ""
+            return ""
+
+    def _iter_pdf_pages(self, reader, deadline: Deadline = None):
+        """Lazily yield page text until the page or character budget is spent.
+
+        Also stops one page after every resume section heading has been seen,
+        since anything further is usually portfolio material.
+        """
+        chars = 0
+        sections_seen = set()
+        complete_at = None
+        for i, page in enumerate(reader.pages):
+            if i >= PDF_MAX_PAGES or chars >= PDF_MAX_CHARS:
+                break
+            if complete_at is not None and i > complete_at + 1:
+                break
+            if deadline is not None:
+                deadline.check("pdf_text")
+
+            extracted = page.extract_text()
+            if not extracted:
+                continue
+
+            piece = extracted[:PDF_MAX_CHARS - chars] + "\n"
+            chars += len(piece)
+            for line in piece.split('\n'):
+                heading = self._match_heading(line)
+                if heading:
+                    sections_seen.add(heading.group(2).lower())
+            if complete_at is None and len(sections_seen) == len(REQUIRED_SECTIONS):
+                complete_at = i
+            yield piece
     
-    def _extract_pdf_text_with_ocr(self, content: bytes) -> str:
+    @traced("ocr")
+    def _extract_pdf_text_with_ocr(self, content: bytes, deadline: Deadline = None) -> str:
         """Extract text from PDF using OCR (for image-based/scanned PDFs)"""
-        if not OCR_AVAILABLE:
+        if not load_ocr():
             log_error("OCR libraries not available - install pdf2image and pytesseract", "resume-parser")
             return ""
         
+        deadline = deadline or Deadline()
+        deadline.check("ocr")
+        return self._run_ocr(content, deadline)
+
+    async def _ocr_fallback(self, content: bytes, deadline: Deadline) -> str:
+        """OCR for scanned PDFs, once a slot is free.
+
+        OCR is CPU-bound; the cap keeps a burst of scans from starving other
+        work. The slot is waited for on the event loop so queued scans don't
+        tie up worker threads.
+        """
+        deadline.check("ocr")
+        async with OCR_LIMIT.hold():
+            try:
+                return await read_in_thread(self._extract_pdf_text_with_ocr, content, deadline)
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                log_error(f"OCR failed: {e}", "resume-parser")
+                return ""
+
+    def _run_ocr(self, content: bytes, deadline: Deadline) -> str:
+        convert_from_bytes, pytesseract = load_ocr()
         try:
-            # Set Tesseract path for Windows
-            tesseract_path = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-            if os.path.exists(tesseract_path):
-                pytesseract.pytesseract.tesseract_cmd = tesseract_path
-            
-            # Convert PDF pages to images
-            images = convert_from_bytes(content, dpi=300)
+            # Convert PDF pages to images (only the pages within budget)
+            images = convert_from_bytes(self._as_bytes(content), dpi=300, last_page=PDF_MAX_PAGES)
             
             # OCR each page
-            text = ""
+            pieces = []
             for i, image in enumerate(images):
+                # Stop between pages once the request is out of time or cancelled
+                deadline.check("ocr")
                 page_text = pytesseract.image_to_string(image, lang='eng')
                 if page_text:
-                    text += page_text + "\n"
+                    pieces.append(page_text + "\n")
                 log_error(f"OCR page {i+1}: extracted {len(page_text)} characters", "resume-parser")
+            text = ''.join(pieces)[:PDF_MAX_CHARS]
             
             if text.strip():
                 log_error(f"OCR successful: extracted {len(text)} total characters", "resume-parser")
@@ -168,17 +477,58 @@ class ResumeParser:
                 log_error("OCR completed but no text found", "resume-parser")
             
             return text
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             log_error(f"OCR extraction error: {e}", "resume-parser")
             return ""
     
+    @traced("docx_text")
     def _extract_docx_text(self, content: bytes) -> str:
-        doc = Document(io.BytesIO(content))
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        """Extract DOCX text straight from the package XML.
+
+        Headers come first (templates often keep contact details there), then
+        the body. Paragraphs, table cells and text boxes are emitted in
+        document order.
+        """
+        lines = []
+        with zipfile.ZipFile(self._open_stream(content)) as archive:
+            names = archive.namelist()
+            # By part number, so header10.xml comes after header2.xml
+            headers = sorted((n for n in names if n.startswith('word/header') and n.endswith('.xml')),
+                             key=lambda n: int(re.sub(r'\D', '', n) or 0))
+            for part in headers + ['word/document.xml']:
+                if part in names:
+                    with archive.open(part) as xml_stream:
+                        lines.extend(self._iter_docx_paragraphs(xml_stream))
+        return ''.join(line + "\n" for line in lines)
+
+    def _iter_docx_paragraphs(self, xml_stream):
+        """Incrementally parse WordprocessingML and yield each paragraph's text"""
+        paragraphs = []
+        fallback_depth = 0
+        for event, elem in ElementTree.iterparse(xml_stream, events=('start', 'end')):
+            tag = elem.tag
+            if tag == MC_FALLBACK:
+                # Text boxes are duplicated in a legacy VML fallback; read only one copy
+                fallback_depth += 1 if event == 'start' else -1
+            elif fallback_depth:
+                continue
+            elif event == 'start':
+                if tag == W_P:
+                    paragraphs.append([])
+            elif tag == W_T and paragraphs:
+                paragraphs[-1].append(elem.text or '')
+            elif tag == W_TAB and paragraphs:
+                paragraphs[-1].append('\t')
+            elif tag in (W_BR, W_CR) and paragraphs:
+                paragraphs[-1].append('\n')
+            elif tag == W_P:
+                # Nested text-box paragraphs close before the paragraph anchoring them
+                yield ''.join(paragraphs.pop())
+                elem.clear()
     
+    @traced("llm")
     async def _parse_with_ai(self, text: str) -> dict:
         """Parse resume text using OpenRouter LLM"""
         if not self.llm:
@@ -205,7 +555,9 @@ Return only valid JSON, no additional text.
 """
         
         try:
-            response = await self.llm.acomplete(prompt)
+            async with LLM_LIMIT.hold():
+                with outbound("openrouter"):
+                    response = await self.llm.acomplete(prompt)
             content = str(response).strip()
             
             # Clean and parse JSON response
@@ -226,6 +578,8 @@ Return only valid JSON, no additional text.
                 log_error("Invalid data structure from OpenRouter", "resume-parser")
                 return self._get_fallback_data()
                 
+        except Overloaded:
+            raise
         except Exception as e:
             log_error(f"OpenRouter parsing failed: {e}", "resume-parser")
             return self._get_fallback_data()
@@ -245,28 +599,26 @@ Return only valid JSON, no additional text.
         log_resume_data(fallback_data)
         return fallback_data
 
+    @traced("fields")
     def _extract_basic_fields(self, text: str) -> dict:
-        """Extract common resume fields from plain text using regex heuristics.
+        """Extract common resume fields from plain text using deterministic heuristics.
 
         This does not rely on external AI and provides deterministic results for
-        name, email, phone, education, work experience and skills.
+        name, email, phone, education, work experience and skills. Every scan
+        is linear in the length of the text.
         """
-        import re
-
         # Normalize
         t = text.replace('\r', '\n')
+        lines, sections = self._tokenize_sections(t)
 
-        # Email
-        email_match = re.search(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", t)
-        email = email_match.group(0) if email_match else ''
-
-        # Phone (simple patterns)
-        phone_match = re.search(r"(\+?\d[\d\-(). ]{6,}\d)", t)
-        phone = phone_match.group(0).strip() if phone_match else ''
+        email = self._find_email(t)
+        phone = self._find_phone(t)
 
         # Name: try the first non-empty line that contains letters and a space and is not 'resume' or 'curriculum'
         name = ''
-        for line in [l.strip() for l in t.split('\n') if l.strip()]:
+        for line in (l.strip() for l in lines):
+            if not line:
+                continue
             low = line.lower()
             if 'name' in low and ':' in line:
                 # handle lines like 'Full Name: Alice Example'
@@ -285,30 +637,14 @@ Return only valid JSON, no additional text.
                     name = candidate
                     break
 
-        # Skills: look for a 'skills' section
+        # Skills: split the section by commas, semicolons or newlines
         skills = []
-        skills_section = re.search(r"skills[:\n\s]*(.+?)(?:\n\n|education|experience|$)", t, re.I | re.S)
-        if skills_section:
-            raw = skills_section.group(1)
-            # split by commas or newlines
-            parts = re.split(r'[;,\n]', raw)
-            skills = [p.strip() for p in parts if p.strip()]
-
-        # Education: capture lines under education heading
-        education = []
-        edu_section = re.search(r"education[:\n\s]*(.+?)(?:\n\n|experience|skills|$)", t, re.I | re.S)
-        if edu_section:
-            raw = edu_section.group(1).strip()
-            edu_lines = [l.strip() for l in raw.split('\n') if l.strip()]
-            education = edu_lines
-
-        # Work experience: capture paragraphs under experience heading
-        experience = []
-        exp_section = re.search(r"(experience|work experience|professional experience)[:\n\s]*(.+?)(?:\n\n|education|skills|$)", t, re.I | re.S)
-        if exp_section:
-            raw = exp_section.group(2).strip()
-            exp_lines = [l.strip() for l in raw.split('\n') if l.strip()]
-            experience = exp_lines
+        for line in sections.get('skills', []):
+            skills.extend(part.strip() for part in SKILL_SEPARATOR_PATTERN.split(line) if part.strip())
+
+        # Education and work experience: one entry per line under the heading
+        education = sections.get('education', [])
+        experience = sections.get('experience', [])
 
         return {
             "Full Name": name,
@@ -321,6 +657,66 @@ Return only valid JSON, no additional text.
             "raw_text": text
         }
     
+    def _match_heading(self, line: str):
+        """The SECTION_HEADING_PATTERN match if `line` is a section heading, else None.
+
+        The section name must be followed by a colon or nothing, on a short
+        line, so prose such as "Experience leading data teams" is not a heading.
+        """
+        if len(line.strip()) > MAX_HEADING_LENGTH:
+            return None
+        heading = SECTION_HEADING_PATTERN.match(line)
+        if heading and (heading.group(3) or not heading.group(4).strip()):
+            return heading
+        return None
+
+    def _tokenize_sections(self, text: str) -> tuple:
+        """Split text into lines and index section bodies in a single pass.
+
+        A section runs from its heading until a blank line or the next heading;
+        blank lines directly after a heading are skipped. Only the first
+        occurrence of each section is kept.
+        """
+        lines = text.split('\n')
+        sections = {}
+        current = None
+        for line in lines:
+            stripped = line.strip()
+            heading = self._match_heading(line)
+            if heading:
+                key = heading.group(2).lower()
+                current = None if key in sections else sections.setdefault(key, [])
+                inline = heading.group(4).strip()
+                if current is not None and inline:
+                    current.append(inline)
+            elif current is not None:
+                if stripped:
+                    current.append(stripped)
+                elif current:
+                    current = None
+        return lines, sections
+
+    def _find_email(self, text: str) -> str:
+        """Return the first email address, expanding around each '@' so no scan repeats"""
+        at = text.find('@')
+        while at != -1:
+            start = at
+            while start > 0 and text[start - 1] in EMAIL_LOCAL_CHARS:
+                start -= 1
+            domain = EMAIL_DOMAIN_PATTERN.match(text, at + 1)
+            if start < at and domain:
+                return text[start:domain.end()]
+            at = text.find('@', at + 1)
+        return ''
+
+    def _find_phone(self, text: str) -> str:
+        """Return the first run of digits and separators with at least 8 characters after any leading +"""
+        for match in PHONE_RUN_PATTERN.finditer(text):
+            candidate = match.group(0).rstrip('-(). ')
+            if len(candidate.lstrip('+')) >= 8:
+                return candidate.strip()
+        return ''
+
     async def _try_llama_cloud(self, content: bytes, filename: str) -> dict:
         """Try LlamaParse for document parsing"""
         if not self.parser:
@@ -328,17 +724,10 @@ Return only valid JSON, no additional text.
             return None
         
         try:
-            # Save content to temporary file for LlamaParse
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix=f".{filename.split('.')[-1]}", delete=False) as tmp_file:
-                tmp_file.write(content)
-                tmp_file_path = tmp_file.name
-            
-            # Parse document with LlamaParse
-            documents = await self.parser.aload_data(tmp_file_path)
-            
-            # Clean up temporary file
-            os.unlink(tmp_file_path)
+            # Hand the bytes to LlamaParse directly; it only needs a file name for the type
+            with span("llamaparse"):
+                with outbound("llama_cloud"):
+                    documents = await self.parser.aload_data(self._as_bytes(content), extra_info={"file_name": filename})
             
             if documents:
                 # Extract text from parsed documents
@@ -351,12 +740,12 @@ Return only valid JSON, no additional text.
                 log_error("No documents parsed by LlamaParse", "resume-parser")
                 return None
                 
+        except Overloaded:
+            raise
         except Exception as e:
             log_error(f"LlamaParse error: {e}", "resume-parser")
             return None
-    
 
-    
     def _get_mime_type(self, filename: str) -> str:
         """Get MIME type for file"""
         if filename.endswith('.pdf'):
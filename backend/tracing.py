@@ -0,0 +1,199 @@
+import asyncio
+import functools
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from .config import TRACE_EXPORT_FILE, TRACE_EXPORT_QUEUE_SIZE
+from .metrics import STAGE_ERRORS, STAGE_LATENCY
+from .profiling import thread_profile
+from .models import dumps
+
+SERVICE_NAME = "auto-form-filler-backend"
+
+# Server-Timing metric names must be HTTP tokens
+_TOKEN_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]")
+
+_current_trace = ContextVar("current_trace", default=None)
+_current_span_id = ContextVar("current_span_id", default=None)
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start_ns", "end_ns", "attributes")
+
+    def __init__(self, name: str, parent_id: str, attributes: dict):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+
+class Trace:
+    """All spans recorded while handling one request"""
+
+    def __init__(self, name: str):
+        self.request_id = uuid.uuid4().hex
+        self.root = Span(name, None, {})
+        self.spans = []
+
+    def finish(self):
+        self.root.end_ns = time.time_ns()
+
+    def stage_timings(self) -> dict:
+        """Total milliseconds per span name; repeated stages are summed"""
+        totals = {}
+        for span in self.spans:
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration_ms
+        return totals
+
+    def server_timing(self) -> str:
+        parts = [f"{_TOKEN_UNSAFE.sub('_', name)};dur={ms:.1f}" for name, ms in self.stage_timings().items()]
+        parts.append(f"total;dur={self.root.duration_ms:.1f}")
+        return ", ".join(parts)
+
+    def to_otlp(self) -> dict:
+        """OTLP/JSON ExportTraceServiceRequest for this trace"""
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [self._otlp_span(span) for span in [self.root, *self.spans]],
+                }],
+            }]
+        }
+
+    def _otlp_span(self, span: Span) -> dict:
+        data = {
+            "traceId": self.request_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 2 if span is self.root else 1,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns or span.start_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in span.attributes.items()],
+        }
+        if span.parent_id:
+            data["parentSpanId"] = span.parent_id
+        return data
+
+
+def _otlp_attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def start_trace(name: str) -> Trace:
+    """Begin a trace for the current request and make it the active context"""
+    trace = Trace(name)
+    _current_trace.set(trace)
+    _current_span_id.set(trace.root.span_id)
+    return trace
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def current_request_id() -> str:
+    trace = _current_trace.get()
+    return trace.request_id if trace else None
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time a pipeline stage; a no-op outside a traced request"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    stage = Span(name, _current_span_id.get(), attributes)
+    token = _current_span_id.set(stage.span_id)
+    try:
+        yield stage
+    except asyncio.CancelledError:
+        # The caller went away (disconnect, a lost race); the stage didn't fail
+        stage.attributes["cancelled"] = True
+        raise
+    except BaseException as e:
+        stage.attributes["error"] = type(e).__name__
+        STAGE_ERRORS.inc(name)
+        raise
+    finally:
+        stage.end_ns = time.time_ns()
+        _current_span_id.reset(token)
+        trace.spans.append(stage)
+        STAGE_LATENCY.observe((stage.end_ns - stage.start_ns) / 1e9, name)
+
+
+def traced(name: str):
+    """Decorator form of span() for sync and async functions
+
+    Sync stages usually run in worker threads, so they are also added to the
+    request's profile when one is being recorded.
+    """
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name), thread_profile():
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Finished traces are written by a background thread so exports never block requests
+_export_queue = queue.Queue(maxsize=TRACE_EXPORT_QUEUE_SIZE)
+_export_thread = None
+
+
+def _export_worker():
+    with open(TRACE_EXPORT_FILE, "ab") as sink:
+        while True:
+            line = _export_queue.get()
+            sink.write(line + b"\n")
+            if _export_queue.empty():
+                sink.flush()
+
+
+def export_queue_depth() -> int:
+    return _export_queue.qsize()
+
+
+def export_trace(trace: Trace):
+    """Queue a finished trace for the OTLP/JSON file sink, if TRACE_EXPORT_FILE is set"""
+    global _export_thread
+    if not TRACE_EXPORT_FILE:
+        return
+    if _export_thread is None:
+        directory = os.path.dirname(TRACE_EXPORT_FILE)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _export_thread = threading.Thread(target=_export_worker, name="trace-exporter", daemon=True)
+        _export_thread.start()
+    try:
+        _export_queue.put_nowait(dumps(trace.to_otlp()))
+    except queue.Full:
+        pass
@@ -0,0 +1,55 @@
+import asyncio
+import os
+import time
+from .config import WARMUP_FORMS_URL, WARMUP_TIMEOUT
+from .logger import logger, log_error
+from .services import google_forms_service, resume_parser
+
+
+async def _warm_ocr():
+    if not await asyncio.to_thread(resume_parser.warm_ocr):
+        return "unavailable"
+
+
+def _steps() -> dict:
+    steps = {}
+    openrouter_key = os.getenv("OPENROUTER_API_KEY")
+    if openrouter_key:
+        steps["llm"] = asyncio.to_thread(resume_parser.shared_llm, openrouter_key)
+    llama_key = os.getenv("LLAMA_CLOUD_API_KEY")
+    if llama_key:
+        steps["llamaparse"] = asyncio.to_thread(resume_parser.shared_llama_parse, llama_key)
+    if WARMUP_FORMS_URL:
+        steps["google_forms"] = asyncio.to_thread(google_forms_service.warm_up, WARMUP_FORMS_URL, WARMUP_TIMEOUT)
+    steps["ocr"] = _warm_ocr()
+    return steps
+
+
+async def _timed(name: str, step):
+    started = time.monotonic()
+    try:
+        outcome = await step
+    except Exception as e:
+        log_error(f"Warm-up step {name} failed: {e}", "warmup")
+        return f"failed: {e}"
+    return outcome if isinstance(outcome, str) else round(time.monotonic() - started, 3)
+
+
+async def warm_up() -> dict:
+    """Build shared clients, open pooled connections and prime caches before taking traffic.
+
+    Steps run concurrently; a failed step is logged and does not stop the
+    others, and whatever is still running after WARMUP_TIMEOUT is abandoned
+    (a step already in a worker thread finishes there). Returns {step: seconds
+    taken, or what went wrong}.
+    """
+    tasks = {name: asyncio.create_task(_timed(name, step)) for name, step in _steps().items()}
+    started = time.monotonic()
+    try:
+        await asyncio.wait(tasks.values(), timeout=WARMUP_TIMEOUT)
+    finally:
+        for task in tasks.values():
+            task.cancel()
+    report = {name: task.result() if task.done() else "timed out" for name, task in tasks.items()}
+    logger.info(f"Warm-up finished in {time.monotonic() - started:.2f}s: {report}")
+    return report
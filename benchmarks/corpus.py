@@ -0,0 +1,224 @@
+"""Deterministic synthetic resume corpus for the pipeline benchmarks.
+
+Run from the repository root to write the corpus to disk:
+
+    python -m benchmarks.corpus --out benchmarks/corpus
+
+Every resume exists as TXT, DOCX, a text-based PDF and a scanned (image-only)
+PDF, in short, medium and long variants. The same seed always produces the
+same documents, so timings from different commits are comparable.
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import zipfile
+from dataclasses import dataclass
+from xml.sax.saxutils import escape
+
+# Pillow renders the scanned PDFs; without it only the other kinds are built
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+KINDS = ("txt", "docx", "pdf", "scanned_pdf")
+
+# Work experience entries per size; long resumes run to several PDF pages
+SIZES = {"short": 2, "medium": 8, "long": 30}
+
+FIRST_NAMES = ["Alice", "Bruno", "Chen", "Divya", "Emeka", "Farah", "Goran", "Hana", "Ivan", "Julia"]
+LAST_NAMES = ["Example", "Okafor", "Lindqvist", "Nakamura", "Patel", "Rossi", "Schmidt", "Torres"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Enterprises"]
+TITLES = ["Software Engineer", "Data Analyst", "Product Manager", "DevOps Engineer", "QA Engineer"]
+SCHOOLS = ["MIT", "Stanford University", "IIT Bombay", "ETH Zurich", "University of Toronto"]
+DEGREES = ["BSc Computer Science", "MSc Data Science", "BEng Electrical Engineering", "MBA"]
+SKILLS = ["Python", "SQL", "Go", "Kubernetes", "React", "AWS", "Terraform", "Spark", "Docker", "Java"]
+BULLETS = [
+    "Built and maintained services handling {n} requests per day",
+    "Reduced report generation time by {n} percent",
+    "Led a team of {n} engineers through a platform migration",
+    "Automated deployment pipelines for {n} repositories",
+]
+
+PDF_LINES_PER_PAGE = 50
+SCAN_DPI = 100
+
+
+@dataclass
+class CorpusDocument:
+    name: str
+    kind: str
+    size: str
+    filename: str
+    content: bytes
+
+
+def resume_lines(rng: random.Random, jobs: int) -> list:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}@example.com",
+        f"+1 ({rng.randint(200, 999)}) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        f"{rng.randint(1, 999)} Main Street, Springfield",
+        "",
+        "Summary",
+        f"{rng.choice(TITLES)} with {jobs} roles of experience across product and platform teams.",
+        "",
+        "Work Experience",
+    ]
+    for i in range(jobs):
+        start = 2024 - 2 * (i + 1)
+        lines.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)}, {start}-{start + 2}")
+        for bullet in rng.sample(BULLETS, 2):
+            lines.append("- " + bullet.format(n=rng.randint(2, 90)))
+    lines += ["", "Education"]
+    for _ in range(rng.randint(1, 2)):
+        lines.append(f"{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)}, {rng.randint(2005, 2020)}")
+    lines += ["", "Skills", ", ".join(rng.sample(SKILLS, 6))]
+    return lines
+
+
+def build_txt(lines: list) -> bytes:
+    return "\n".join(lines).encode("utf-8")
+
+
+def build_docx(lines: list) -> bytes:
+    """Minimal WordprocessingML package: one paragraph per line"""
+    paragraphs = "".join(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in lines)
+    parts = {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            '</Types>'
+        ),
+        "_rels/.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
+            '</Relationships>'
+        ),
+        "word/document.xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body>{paragraphs}</w:body></w:document>'
+        ),
+    }
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, xml in parts.items():
+            # Fixed timestamps keep the bytes identical between runs
+            archive.writestr(zipfile.ZipInfo(name, date_time=(2024, 1, 1, 0, 0, 0)), xml)
+    return buffer.getvalue()
+
+
+def _pages(lines: list) -> list:
+    return [lines[i:i + PDF_LINES_PER_PAGE] for i in range(0, len(lines), PDF_LINES_PER_PAGE)] or [[]]
+
+
+def build_text_pdf(lines: list) -> bytes:
+    """Text-based PDF drawn with the standard Helvetica font"""
+    pages = _pages(lines)
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and content stream per page
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_refs = []
+    for page_lines in pages:
+        ops = ["BT", "/F1 10 Tf", "14 TL", "50 770 Td"]
+        for line in page_lines:
+            text = line.encode("latin-1", "replace").decode("latin-1")
+            text = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(f"({text}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        page_number = len(objects) + 1
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_number + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_refs.append(f"{page_number} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {len(pages)} >>".encode()
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def build_scanned_pdf(lines: list) -> bytes:
+    """Image-only PDF, as produced by a scanner: no fonts or text operators"""
+    try:
+        font = ImageFont.load_default(size=14)
+    except TypeError:
+        # Pillow < 10.1 only has the fixed bitmap font
+        font = ImageFont.load_default()
+
+    images = []
+    for page_lines in _pages(lines):
+        image = Image.new("L", (int(8.5 * SCAN_DPI), 11 * SCAN_DPI), 255)
+        draw = ImageDraw.Draw(image)
+        for i, line in enumerate(page_lines):
+            draw.text((50, 40 + i * 20), line, fill=0, font=font)
+        images.append(image)
+
+    buffer = io.BytesIO()
+    images[0].save(buffer, "PDF", resolution=SCAN_DPI, save_all=True, append_images=images[1:])
+    return buffer.getvalue()
+
+
+BUILDERS = {
+    "txt": (".txt", build_txt),
+    "docx": (".docx", build_docx),
+    "pdf": (".pdf", build_text_pdf),
+    "scanned_pdf": (".pdf", build_scanned_pdf),
+}
+
+
+def generate_corpus(seed: int = 0, per_size: int = 2, kinds: tuple = KINDS) -> list:
+    """Build `per_size` resumes per size, each rendered in every requested kind"""
+    if not PIL_AVAILABLE and "scanned_pdf" in kinds:
+        print("Pillow is not installed; skipping scanned PDFs", file=sys.stderr)
+        kinds = tuple(k for k in kinds if k != "scanned_pdf")
+
+    rng = random.Random(seed)
+    documents = []
+    for size, jobs in SIZES.items():
+        for i in range(per_size):
+            lines = resume_lines(rng, jobs)
+            for kind in kinds:
+                extension, build = BUILDERS[kind]
+                name = f"{size}-{i}-{kind}"
+                documents.append(CorpusDocument(name, kind, size, name + extension, build(lines)))
+    return documents
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--out", default="benchmarks/corpus")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--per-size", type=int, default=2)
+    args = arg_parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for document in generate_corpus(args.seed, args.per_size):
+        with open(os.path.join(args.out, document.filename), "wb") as f:
+            f.write(document.content)
+        print(f"{document.filename:28} {len(document.content):>9} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Speed and field recall of the DOCX extractor against the python-docx paragraph walk.
+
+Run from the repository root:
+
+    python -m benchmarks.docx_extraction
+
+Builds resumes with python-docx the way templates lay them out: contact
+details in the page header, education and phone in a table, skills in a text
+box, then --sizes experience paragraphs. Each document is extracted with
+ResumeParser._extract_docx_text and with the python-docx walk it replaced,
+and the fields _extract_basic_fields finds in either text are compared. Fails
+(non-zero exit) if the XML extractor misses a field, is slower than the walk
+on the largest document, or reads section headers out of order.
+"""
+import argparse
+import io
+import sys
+import time
+
+import docx
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+from backend.services.resume_parser import ResumeParser
+
+EMAIL = "jane.roe@example.com"
+PHONE = "+1 (555) 123-4567"
+EDUCATION = "BSc Computer Science, State University"
+SKILL = "Python"
+
+# A VML text box, as older Word versions and many templates write them
+TEXT_BOX = (
+    f'<w:r {nsdecls("w")} xmlns:v="urn:schemas-microsoft-com:vml"><w:pict><v:shape><v:textbox><w:txbxContent>'
+    '<w:p><w:r><w:t>Skills</w:t></w:r></w:p>'
+    f'<w:p><w:r><w:t>{SKILL}, SQL, Docker</w:t></w:r></w:p>'
+    '</w:txbxContent></v:textbox></v:shape></w:pict></w:r>'
+)
+
+
+def build_resume(paragraphs: int, header_sections: int = 1) -> bytes:
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = f"Jane Roe | {EMAIL}"
+    document.add_paragraph()._p.append(parse_xml(TEXT_BOX))
+
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Education"
+    table.cell(0, 1).text = "Phone"
+    table.cell(1, 0).text = EDUCATION
+    table.cell(1, 1).text = PHONE
+
+    document.add_paragraph("Experience")
+    for i in range(paragraphs):
+        document.add_paragraph(f"Engineer at Company {i}: built services, reviewed code and mentored the team.")
+
+    # Extra sections with their own headers, for the header order check
+    for i in range(2, header_sections + 1):
+        section = document.add_section()
+        section.header.is_linked_to_previous = False
+        section.header.paragraphs[0].text = f"Header section {i}"
+        document.add_paragraph(f"Section {i}")
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def legacy_extract(content: bytes) -> str:
+    """The python-docx paragraph walk _extract_docx_text replaced"""
+    return "\n".join(p.text for p in docx.Document(io.BytesIO(content)).paragraphs)
+
+
+def best_time(fn, content: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def found_fields(parser: ResumeParser, text: str) -> dict:
+    fields = parser._extract_basic_fields(text)
+    return {
+        "header email": fields["Email"] == EMAIL,
+        "table phone": fields["Phone Number"] == PHONE,
+        "table education": EDUCATION in text,
+        "text box skills": SKILL in fields["Skills"],
+    }
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", default="40,400,4000", help="comma-separated experience paragraph counts")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    parser = ResumeParser()
+    failures = 0
+
+    print(f"{'paragraphs':>10} {'xml ms':>9} {'python-docx ms':>15} {'speed-up':>9}")
+    for size in sizes:
+        content = build_resume(size)
+        xml_s = best_time(parser._extract_docx_text, content, args.repeat)
+        legacy_s = best_time(legacy_extract, content, args.repeat)
+        print(f"{size:>10} {xml_s * 1000:>9.1f} {legacy_s * 1000:>15.1f} {legacy_s / xml_s:>8.1f}x")
+    if xml_s > legacy_s:
+        print("XML extractor slower than python-docx on the largest document")
+        failures += 1
+
+    content = build_resume(sizes[0])
+    xml_found = found_fields(parser, parser._extract_docx_text(content))
+    legacy_found = found_fields(parser, legacy_extract(content))
+    print(f"\n{'field':18} {'xml':>5} {'python-docx':>12}")
+    for field in xml_found:
+        print(f"{field:18} {'yes' if xml_found[field] else 'NO':>5} {'yes' if legacy_found[field] else 'no':>12}")
+    failures += sum(not found for found in xml_found.values())
+
+    # Header parts are numbered header1.xml, header2.xml, ... in section order
+    text = parser._extract_docx_text(build_resume(sizes[0], header_sections=12))
+    positions = [text.index(f"Header section {i}") for i in range(2, 13)]
+    in_order = positions == sorted(positions)
+    print(f"\nheaders of 12 sections in order: {'yes' if in_order else 'NO'}")
+    failures += not in_order
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""Fuzz and scaling checks for ResumeParser._extract_basic_fields.
+
+Run from the repository root:
+
+    python -m benchmarks.field_extraction
+
+The fuzz pass compares the email and phone scanners against the regexes they
+replaced. The scaling pass times pathological inputs at doubling sizes and
+fails if an 8x larger input takes more than MAX_SCALING_RATIO times longer.
+"""
+import argparse
+import random
+import re
+import sys
+import time
+
+from backend.services.resume_parser import ResumeParser
+
+# The original patterns, used as an oracle for the fuzz pass
+LEGACY_EMAIL_PATTERN = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+LEGACY_PHONE_PATTERN = re.compile(r"(\+?\d[\d\-(). ]{6,}\d)")
+
+FUZZ_ALPHABET = "aZ09_.+-@ ()\n\n:;,"
+FUZZ_WORDS = ["skills", "Education", "Work Experience", "name:", "alice@example.com", "+1 (555) 123-4567",
+              # Runs either side of the 8-character minimum, with and without a leading +
+              "+1234567", "+12345678", "1234567", "12345678", "+555 01", "++1234567"]
+
+# Linear scaling gives ~8x for an 8x larger input; quadratic gives ~64x
+MAX_SCALING_RATIO = 20
+
+PATHOLOGICAL_INPUTS = {
+    "email-local-run": lambda n: "a" * n,
+    "dangling-at": lambda n: ("a" * 50 + "@") * (n // 51),
+    "phone-separators": lambda n: "1" + "(" * n,
+    "digit-pairs": lambda n: "1 " * (n // 2),
+    "heading-spam": lambda n: "Skills:\n" * (n // 8),
+    "long-line": lambda n: "Education " + "x" * n,
+}
+
+
+def random_text(rng: random.Random, length: int) -> str:
+    pieces = []
+    while sum(len(p) for p in pieces) < length:
+        if rng.random() < 0.1:
+            pieces.append(rng.choice(FUZZ_WORDS))
+        else:
+            pieces.append(rng.choice(FUZZ_ALPHABET))
+    return "".join(pieces)
+
+
+def fuzz(parser: ResumeParser, iterations: int, seed: int) -> int:
+    rng = random.Random(seed)
+    failures = 0
+    for i in range(iterations):
+        text = random_text(rng, rng.randint(0, 400))
+
+        legacy_email = LEGACY_EMAIL_PATTERN.search(text)
+        legacy_phone = LEGACY_PHONE_PATTERN.search(text)
+        expected = (
+            legacy_email.group(0) if legacy_email else "",
+            legacy_phone.group(0).strip() if legacy_phone else "",
+        )
+        actual = (parser._find_email(text), parser._find_phone(text))
+        if actual != expected:
+            failures += 1
+            print(f"mismatch #{i}: expected {expected!r}, got {actual!r} for {text!r}")
+
+        result = parser._extract_basic_fields(text)
+        if not all(isinstance(result[k], list) for k in ("Skills", "Education", "Work Experience")):
+            failures += 1
+            print(f"bad section types #{i}: {result!r}")
+    return failures
+
+
+def time_call(fn, text: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def scaling(parser: ResumeParser, base_size: int) -> int:
+    failures = 0
+    sizes = [base_size * 2 ** k for k in range(4)]
+    for name, make in PATHOLOGICAL_INPUTS.items():
+        timings = [time_call(parser._extract_basic_fields, make(n)) for n in sizes]
+        ratio = timings[-1] / max(timings[0], 1e-9)
+        status = "ok" if ratio <= MAX_SCALING_RATIO else "NONLINEAR"
+        if status != "ok":
+            failures += 1
+        cells = "  ".join(f"{n}:{t * 1000:.2f}ms" for n, t in zip(sizes, timings))
+        print(f"{name:18s} {cells}  x{ratio:.1f} {status}")
+
+    # For reference: how the legacy email regex scales on the same input
+    legacy = [time_call(LEGACY_EMAIL_PATTERN.search, "a" * n, repeat=1) for n in sizes[:3]]
+    cells = "  ".join(f"{n}:{t * 1000:.2f}ms" for n, t in zip(sizes, legacy))
+    print(f"{'legacy email':18s} {cells}")
+    return failures
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--iterations", type=int, default=5000)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--base-size", type=int, default=5000)
+    args = arg_parser.parse_args()
+
+    parser = ResumeParser()
+    failures = fuzz(parser, args.iterations, args.seed)
+    print(f"fuzz: {args.iterations} cases, {failures} failures")
+    failures += scaling(parser, args.base_size)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Import-time budget for the backend.
+
+Run from the repository root:
+
+    python -m benchmarks.import_time --budget-ms 1500
+
+Imports backend.main in a fresh interpreter under `python -X importtime` and
+fails (non-zero exit) if the import takes longer than --budget-ms, or if it
+pulls in any of HEAVY_MODULES, which the services import on first use. The
+slowest top-level imports are listed either way.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# Modules that must not load at startup
+HEAVY_MODULES = ("selenium", "bs4", "llama_index", "llama_parse", "pdf2image", "pytesseract", "PIL")
+
+
+def measure(module: str) -> list:
+    """(self_us, cumulative_us, depth, name) for every module imported by `module`"""
+    # No API keys: importing must not depend on configuration
+    env = {k: v for k, v in os.environ.items() if not k.endswith("_API_KEY")}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--module", default="backend.main")
+    arg_parser.add_argument("--budget-ms", type=float, default=1500)
+    arg_parser.add_argument("--top", type=int, default=15)
+    args = arg_parser.parse_args()
+
+    rows = measure(args.module)
+    total_ms = next(cumulative for _, cumulative, _, name in rows if name == args.module) / 1000
+    heavy = sorted({name for *_, name in rows if name.split(".")[0] in HEAVY_MODULES})
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for self_us, cumulative_us, depth, name in sorted(rows, key=lambda r: -r[1])[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {'  ' * depth}{name}")
+    print(f"\nimport {args.module}: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if total_ms > args.budget_ms:
+        print("BUDGET EXCEEDED")
+        failed = True
+    if heavy:
+        print(f"Heavy modules imported at startup: {', '.join(heavy)}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""Latency distributions for the local stand-in servers.
+
+A spec is "<distribution>:<params>" in seconds:
+
+    fixed:0.5             always 0.5s
+    uniform:0.2,1.5       uniformly between 0.2s and 1.5s
+    normal:0.8,0.2        mean 0.8s, standard deviation 0.2s (clamped at 0)
+    lognormal:0.8,0.5     median 0.8s, sigma 0.5 (long right tail, like real APIs)
+    exponential:0.3       mean 0.3s
+"""
+import math
+import random
+
+
+def parse_latency(spec: str, rng: random.Random = None):
+    """Return a zero-argument function that samples a delay in seconds"""
+    rng = rng or random.Random()
+    name, _, params = (spec or "fixed:0").partition(":")
+    try:
+        values = [float(v) for v in params.split(",") if v]
+    except ValueError:
+        raise ValueError(f"Invalid latency spec: {spec!r}") from None
+
+    if name == "fixed" and len(values) == 1:
+        return lambda: values[0]
+    if name == "uniform" and len(values) == 2:
+        return lambda: rng.uniform(values[0], values[1])
+    if name == "normal" and len(values) == 2:
+        return lambda: max(0.0, rng.gauss(values[0], values[1]))
+    if name == "lognormal" and len(values) == 2:
+        mu = math.log(values[0]) if values[0] > 0 else 0.0
+        return lambda: rng.lognormvariate(mu, values[1])
+    if name == "exponential" and len(values) == 1:
+        return lambda: rng.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+    raise ValueError(f"Invalid latency spec: {spec!r}")
@@ -0,0 +1,378 @@
+"""End-to-end load test of the API with an SLO report.
+
+Start the stand-ins and the backend pointed at them, then run the load:
+
+    python -m benchmarks.mock_openrouter --port 8100 --latency lognormal:0.8,0.5 &
+    python -m benchmarks.mock_google_forms --port 8200 &
+    python -m benchmarks.load_test --spawn-workers 2 --stages 2x30,5x30 --output load.json
+
+--spawn-workers starts `uvicorn backend.main:app` itself with OPENROUTER_API_BASE
+pointing at the OpenRouter stand-in; otherwise pass --target and --pid for an
+already running server. Requests arrive open-loop (Poisson by default) at each
+stage's rate, so a slow server builds a backlog instead of slowing the load.
+
+Requests are spread over --clients simulated clients, identified to the server
+by X-Forwarded-For (spawned servers trust one proxy hop); --hot-client-share
+sends that fraction of all requests from a single client, to check that the
+per-client rate limit sheds its excess without hurting everyone else.
+
+The report gives throughput, p50/p95/p99 latency and error rates per endpoint,
+the rate and latency of requests shed with 429/503 (admission control),
+per-client-group results and the peak RSS of every server process. These are checked against
+DEFAULT_SLOS (or --slo-file), and the exit status is non-zero on a breach.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.corpus import generate_corpus
+
+ENDPOINTS = {
+    "parse-resume": "/api/parse-resume",
+    "check-ats": "/api/check-ats",
+    "fill-form": "/api/fill-form",
+}
+
+# Latency in milliseconds; error_rate counts transport errors, non-2xx responses
+# other than 429/503 and bodies with "success": false other than the ATS
+# rejection of scanned PDFs. Shed requests (429/503) are reported separately
+# and should be turned away quickly
+DEFAULT_SLOS = {
+    "parse-resume": {"p95_ms": 3000, "p99_ms": 8000, "error_rate": 0.01, "shed_p95_ms": 100},
+    "check-ats": {"p95_ms": 200, "p99_ms": 500, "error_rate": 0.001},
+    "fill-form": {"p95_ms": 8000, "p99_ms": 15000, "error_rate": 0.02, "shed_p95_ms": 100},
+    "server": {"peak_rss_mb": 512},
+}
+
+SHED_OUTCOMES = ("http_429", "http_503")
+
+MIME_TYPES = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".txt": "text/plain",
+}
+
+
+def parse_weights(spec: str, allowed) -> dict:
+    """"a=3,b=1" -> {"a": 3.0, "b": 1.0}"""
+    weights = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in allowed:
+            raise SystemExit(f"Unknown name {name!r}; expected one of {', '.join(allowed)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def parse_stages(spec: str) -> list:
+    """"2x30,5x60" -> [(2.0 req/s, 30s), (5.0 req/s, 60s)]"""
+    stages = []
+    for part in spec.split(","):
+        rate, _, seconds = part.partition("x")
+        stages.append((float(rate), float(seconds)))
+    return stages
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+class RssSampler:
+    """Samples VmRSS of the server processes and their children from /proc"""
+    def __init__(self, pids: list, interval: float = 0.25):
+        self.pids = pids
+        self.interval = interval
+        self.peaks = {}
+
+    def _children(self, pid: int) -> list:
+        children = []
+        try:
+            for task in os.listdir(f"/proc/{pid}/task"):
+                with open(f"/proc/{pid}/task/{task}/children") as f:
+                    children.extend(int(c) for c in f.read().split())
+        except OSError:
+            pass
+        return children
+
+    def _rss_kb(self, pid: int) -> int:
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        return 0
+
+    def sample(self):
+        for root in self.pids:
+            for pid in [root, *self._children(root)]:
+                rss = self._rss_kb(pid)
+                if rss > self.peaks.get(pid, 0):
+                    self.peaks[pid] = rss
+
+    async def run(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+
+class LoadTest:
+    def __init__(self, args, documents: list, form_urls: list):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.mix = parse_weights(args.mix, ENDPOINTS)
+        kinds = parse_weights(args.kinds, ("txt", "docx", "pdf", "scanned_pdf"))
+        self.documents = [d for d in documents if d.kind in kinds]
+        self.document_weights = [kinds[d.kind] for d in self.documents]
+        self.form_urls = form_urls
+        # endpoint -> list of (latency seconds, outcome, client)
+        self.samples = {name: [] for name in self.mix}
+        self.clients = [f"10.0.{i // 256}.{i % 256}" for i in range(max(1, args.clients))]
+        self.in_flight = 0
+        self.dropped = 0
+
+    def _request_args(self, endpoint: str) -> tuple:
+        document = self.rng.choices(self.documents, self.document_weights)[0]
+        extension = os.path.splitext(document.filename)[1]
+        request = {"files": {"file": (document.filename, document.content, MIME_TYPES[extension])}}
+        if endpoint == "fill-form":
+            request["data"] = {"form_url": self.rng.choice(self.form_urls)}
+        return request, document
+
+    def _pick_client(self) -> str:
+        # Client 0 is the hot one when --hot-client-share is set
+        if self.rng.random() < self.args.hot_client_share:
+            return self.clients[0]
+        return self.rng.choice(self.clients[1:] or self.clients)
+
+    async def _one(self, client: httpx.AsyncClient, endpoint: str):
+        request, document = self._request_args(endpoint)
+        address = self._pick_client()
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            response = await client.post(ENDPOINTS[endpoint], headers={"X-Forwarded-For": address}, **request)
+            if response.status_code >= 400:
+                outcome = f"http_{response.status_code}"
+            else:
+                body = response.json()
+                if body.get("success") is False and body.get("ats_friendly") is not False:
+                    outcome = "app_error"
+                elif body.get("ats_friendly") is False and document.kind != "scanned_pdf":
+                    outcome = "app_error"
+        except httpx.HTTPError as e:
+            outcome = type(e).__name__
+        except asyncio.CancelledError:
+            # Still in flight when the drain timeout ran out
+            outcome = "cancelled"
+            raise
+        finally:
+            self.samples[endpoint].append((time.perf_counter() - started, outcome, address))
+            self.in_flight -= 1
+
+    async def run(self, client: httpx.AsyncClient, stages: list):
+        endpoints, weights = list(self.mix), list(self.mix.values())
+        tasks = set()
+        for rate, seconds in stages:
+            stage_end = time.perf_counter() + seconds
+            while time.perf_counter() < stage_end:
+                gap = self.rng.expovariate(rate) if self.args.arrival == "poisson" else 1 / rate
+                await asyncio.sleep(gap)
+                if self.in_flight >= self.args.max_in_flight:
+                    self.dropped += 1
+                    continue
+                self.in_flight += 1
+                task = asyncio.create_task(self._one(client, self.rng.choices(endpoints, weights)[0]))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.wait(tasks, timeout=self.args.drain_timeout)
+        # Cancel the stragglers and wait for them before the client is closed
+        pending = list(tasks)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def summary(self, elapsed: float) -> dict:
+        endpoints = {}
+        for endpoint, samples in self.samples.items():
+            latencies = sorted(latency * 1000 for latency, _, _ in samples)
+            shed_latencies = sorted(latency * 1000 for latency, outcome, _ in samples if outcome in SHED_OUTCOMES)
+            outcomes = {}
+            for _, outcome, _ in samples:
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            errors = len(samples) - outcomes.get("ok", 0) - len(shed_latencies)
+            endpoints[endpoint] = {
+                "requests": len(samples),
+                "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0,
+                "p50_ms": round(percentile(latencies, 0.50) or 0, 1),
+                "p95_ms": round(percentile(latencies, 0.95) or 0, 1),
+                "p99_ms": round(percentile(latencies, 0.99) or 0, 1),
+                "max_ms": round(latencies[-1], 1) if latencies else 0,
+                "error_rate": round(errors / len(samples), 4) if samples else 0,
+                "shed_rate": round(len(shed_latencies) / len(samples), 4) if samples else 0,
+                "shed_p95_ms": round(percentile(shed_latencies, 0.95), 1) if shed_latencies else None,
+                "outcomes": outcomes,
+            }
+        return endpoints
+
+    def client_summary(self) -> dict:
+        """Results for the hot client vs everyone else, across endpoints"""
+        groups = {}
+        for samples in self.samples.values():
+            for latency, outcome, address in samples:
+                group = "hot" if address == self.clients[0] and self.args.hot_client_share else "others"
+                groups.setdefault(group, []).append((latency, outcome))
+        summary = {}
+        for group, samples in groups.items():
+            ok = sorted(latency * 1000 for latency, outcome in samples if outcome == "ok")
+            shed = sum(1 for _, outcome in samples if outcome in SHED_OUTCOMES)
+            summary[group] = {
+                "requests": len(samples),
+                "ok": len(ok),
+                "shed_rate": round(shed / len(samples), 4),
+                "ok_p95_ms": round(percentile(ok, 0.95), 1) if ok else None,
+            }
+        return summary
+
+
+def check_slos(endpoints: dict, peak_rss_mb: dict, slos: dict) -> list:
+    breaches = []
+    for endpoint, limits in slos.items():
+        if endpoint == "server":
+            for pid, rss in peak_rss_mb.items():
+                if "peak_rss_mb" in limits and rss > limits["peak_rss_mb"]:
+                    breaches.append(f"server pid {pid}: peak RSS {rss} MB > {limits['peak_rss_mb']} MB")
+            continue
+        result = endpoints.get(endpoint)
+        if not result or not result["requests"]:
+            continue
+        for key, limit in limits.items():
+            if result.get(key) is not None and result[key] > limit:
+                breaches.append(f"{endpoint}: {key} {result[key]} > {limit}")
+    return breaches
+
+
+def spawn_server(args) -> subprocess.Popen:
+    # The load generator stands in for a proxy, sending each simulated client's address
+    env = dict(os.environ, OPENROUTER_API_BASE=args.openrouter_base, OPENROUTER_API_KEY=os.getenv("OPENROUTER_API_KEY", "load-test"),
+               TRUSTED_PROXY_HOPS="1")
+    port = httpx.URL(args.target).port or 8000
+    command = [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port),
+               "--workers", str(args.spawn_workers), "--log-level", "warning"]
+    return subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL)
+
+
+async def wait_until_up(client: httpx.AsyncClient, timeout: float = 30):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get("/api/health")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit("Server did not become healthy")
+
+
+async def main_async(args) -> int:
+    slos = DEFAULT_SLOS
+    if args.slo_file:
+        with open(args.slo_file) as f:
+            slos = json.load(f)
+
+    server = spawn_server(args) if args.spawn_workers else None
+    pids = [server.pid] if server else args.pid
+    try:
+        async with httpx.AsyncClient(base_url=args.target, timeout=args.timeout,
+                                     limits=httpx.Limits(max_connections=args.max_in_flight)) as client:
+            await wait_until_up(client)
+
+            form_urls = []
+            if "fill-form" in args.mix:
+                form_urls = (await client.get(args.forms_index, timeout=10)).json()["forms"]
+
+            test = LoadTest(args, generate_corpus(args.seed, per_size=2), form_urls)
+            sampler = RssSampler(pids)
+            sampler_task = asyncio.create_task(sampler.run())
+            started = time.perf_counter()
+            await test.run(client, parse_stages(args.stages))
+            elapsed = time.perf_counter() - started
+            sampler_task.cancel()
+            sampler.sample()
+    finally:
+        if server:
+            server.send_signal(signal.SIGINT)
+            server.wait(timeout=30)
+
+    endpoints = test.summary(elapsed)
+    peak_rss_mb = {str(pid): round(kb / 1024, 1) for pid, kb in sampler.peaks.items()}
+    breaches = check_slos(endpoints, peak_rss_mb, slos)
+    report = {
+        "target": args.target,
+        "config": {"stages": args.stages, "arrival": args.arrival, "mix": args.mix, "kinds": args.kinds,
+                   "clients": args.clients, "hot_client_share": args.hot_client_share, "seed": args.seed},
+        "elapsed_s": round(elapsed, 1),
+        "dropped": test.dropped,
+        "endpoints": endpoints,
+        "clients": test.client_summary(),
+        "peak_rss_mb": peak_rss_mb,
+        "slos": slos,
+        "breaches": breaches,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    for endpoint, r in endpoints.items():
+        print(f"{endpoint:13} {r['requests']:6} req  {r['throughput_rps']:7.2f} rps  "
+              f"p50 {r['p50_ms']:8.1f}  p95 {r['p95_ms']:8.1f}  p99 {r['p99_ms']:8.1f} ms  errors {r['error_rate']:.2%}  shed {r['shed_rate']:.2%}")
+    for group, r in report["clients"].items():
+        ok_p95 = f"{r['ok_p95_ms']:8.1f} ms" if r["ok_p95_ms"] is not None else "       -"
+        print(f"clients {group:6} {r['requests']:6} req  shed {r['shed_rate']:.2%}  ok p95 {ok_p95}")
+    for pid, rss in peak_rss_mb.items():
+        print(f"pid {pid:>8} peak RSS {rss:8.1f} MB")
+    if test.dropped:
+        print(f"{test.dropped} arrivals dropped at --max-in-flight {args.max_in_flight}")
+    for breach in breaches:
+        print(f"SLO BREACH: {breach}")
+    print("SLOs met" if not breaches else f"{len(breaches)} SLO breach(es)")
+    return 1 if breaches else 0
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--target", default="http://127.0.0.1:8000")
+    arg_parser.add_argument("--stages", default="2x30", help="comma-separated <rate req/s>x<seconds>")
+    arg_parser.add_argument("--arrival", choices=("poisson", "constant"), default="poisson")
+    arg_parser.add_argument("--mix", default="parse-resume=3,check-ats=1,fill-form=1", help="endpoint weights")
+    arg_parser.add_argument("--kinds", default="txt=1,docx=1,pdf=2,scanned_pdf=1", help="resume kind weights")
+    arg_parser.add_argument("--forms-index", default="http://127.0.0.1:8200/forms", help="form list from the Forms stand-in")
+    arg_parser.add_argument("--openrouter-base", default="http://127.0.0.1:8100/api/v1", help="used with --spawn-workers")
+    arg_parser.add_argument("--spawn-workers", type=int, default=0, help="start uvicorn with this many workers")
+    arg_parser.add_argument("--pid", type=int, action="append", default=[], help="server process to sample RSS from")
+    arg_parser.add_argument("--clients", type=int, default=20, help="simulated client addresses")
+    arg_parser.add_argument("--hot-client-share", type=float, default=0.0, help="fraction of requests from one client")
+    arg_parser.add_argument("--max-in-flight", type=int, default=200)
+    arg_parser.add_argument("--timeout", type=float, default=60)
+    arg_parser.add_argument("--drain-timeout", type=float, default=60)
+    arg_parser.add_argument("--slo-file", help="JSON file in the shape of DEFAULT_SLOS")
+    arg_parser.add_argument("--output")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
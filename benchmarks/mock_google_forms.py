@@ -0,0 +1,206 @@
+"""Local Google Forms stand-in with a synthetic form generator.
+
+Run from the repository root:
+
+    python -m benchmarks.mock_google_forms --port 8200 --forms 5 --questions 20 --pages 3 --submit-latency uniform:0.05,0.3 --failure-rate 0.02
+
+GET /forms lists the generated forms' viewform URLs, which can be passed to
+/api/fill-form (or GoogleFormsService) in place of docs.google.com links:
+
+    http://127.0.0.1:8200/forms/d/e/<form_id>/viewform
+
+viewform pages embed FB_PUBLIC_LOAD_DATA_ in the same layout as Google's,
+padded to a realistic page size. POST .../formResponse records the answers,
+returning 400 when a required question is empty (or, with --strict-choices,
+when a choice answer is not one of the options). It can also inject 500 and
+429 responses. GET /stats reports the counts.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+from urllib.parse import parse_qsl
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse
+
+from benchmarks.latency import parse_latency
+
+# Question type codes used in FB_PUBLIC_LOAD_DATA_
+SHORT_ANSWER, PARAGRAPH, MULTIPLE_CHOICE, DROPDOWN, CHECKBOXES, LINEAR_SCALE, PAGE_BREAK, DATE = 0, 1, 2, 3, 4, 5, 8, 9
+CHOICE_TYPES = (MULTIPLE_CHOICE, DROPDOWN, CHECKBOXES, LINEAR_SCALE)
+
+# (title, type, options) — a mix of questions that map to resume fields and ones that don't
+QUESTION_POOL = [
+    ("Full Name", SHORT_ANSWER, None),
+    ("Email Address", SHORT_ANSWER, None),
+    ("Phone Number", SHORT_ANSWER, None),
+    ("Current Address", PARAGRAPH, None),
+    ("Highest Degree", DROPDOWN, ["High School", "Bachelor's", "Master's", "PhD"]),
+    ("University / College", SHORT_ANSWER, None),
+    ("Work Experience", PARAGRAPH, None),
+    ("Current Company", SHORT_ANSWER, None),
+    ("Key Skills", PARAGRAPH, None),
+    ("Technologies you have used", CHECKBOXES, ["Python", "Java", "SQL", "AWS", "React", "Docker"]),
+    ("Years of experience", MULTIPLE_CHOICE, ["0-1", "2-4", "5-9", "10+"]),
+    ("Preferred work mode", MULTIPLE_CHOICE, ["Remote", "Hybrid", "On-site"]),
+    ("How did you hear about us?", DROPDOWN, ["LinkedIn", "Referral", "Job board", "Other"]),
+    ("Rate your communication skills", LINEAR_SCALE, ["1", "2", "3", "4", "5"]),
+    ("Earliest start date", DATE, None),
+    ("LinkedIn profile", SHORT_ANSWER, None),
+    ("Why do you want to join?", PARAGRAPH, None),
+]
+
+FILLER_SCRIPT = "var _docs_flag_initialData = {\"docs-fwds\": \"%s\"};\n"
+
+
+def generate_form(form_id: str, questions: int, pages: int = 1, seed: int = 0, required_rate: float = 0.3) -> list:
+    """Build an FB_PUBLIC_LOAD_DATA_ structure with `questions` questions over `pages` pages"""
+    rng = random.Random(f"{seed}:{form_id}")
+    items = []
+    next_id = rng.randint(10 ** 8, 10 ** 9)
+    per_page = max(1, -(-questions // max(pages, 1)))
+
+    for index in range(questions):
+        if index and index % per_page == 0:
+            items.append([next_id, f"Page {index // per_page + 1}", None, PAGE_BREAK, None, None, None, None, None, None, None, [None, 0]])
+            next_id += 1
+
+        title, kind, options = QUESTION_POOL[index % len(QUESTION_POOL)]
+        if index >= len(QUESTION_POOL):
+            title = f"{title} ({index // len(QUESTION_POOL) + 1})"
+        option_list = [[option, None, None, None, 0] for option in options] if options else None
+        required = 1 if rng.random() < required_rate else 0
+        entry = [next_id + 1, option_list, required]
+        if kind == LINEAR_SCALE:
+            entry += [["Poor", "Excellent"]]
+        items.append([next_id, title, None, kind, [entry]])
+        next_id += 2
+
+    title = f"Mock application form {form_id}"
+    return [None, ["Generated for offline benchmarks", items, None, None, None, None, None, None, title, 1],
+            "/forms", title, None, None, None, "", None, 0, 0, None, "", 0, f"e/{form_id}/", 0, "[]", 0, 0]
+
+
+def render_viewform(data: list, padding: int) -> str:
+    """viewform HTML: filler scripts like Google's, then the form data"""
+    filler = FILLER_SCRIPT % ("x" * max(0, padding - len(FILLER_SCRIPT)))
+    return (
+        "<!DOCTYPE html><html><head><title>" + data[3] + "</title>"
+        f"<script>{filler}</script></head><body><form></form>"
+        f"<script>var FB_PUBLIC_LOAD_DATA_ = {json.dumps(data)};</script>"
+        "</body></html>"
+    )
+
+
+def form_questions(data: list) -> dict:
+    """entry id -> (required, options or None) for answer validation"""
+    questions = {}
+    for item in data[1][1]:
+        if item[3] == PAGE_BREAK:
+            continue
+        for entry in item[4]:
+            options = [o[0] for o in entry[1]] if entry[1] and item[3] in CHOICE_TYPES else None
+            questions[f"entry.{entry[0]}"] = (entry[2] == 1, options)
+    return questions
+
+
+class MockSettings:
+    """Server state built from the parsed command line"""
+    def __init__(self, args):
+        self.rng = random.Random(args.seed)
+        self.view_latency = parse_latency(args.view_latency, self.rng)
+        self.submit_latency = parse_latency(args.submit_latency, self.rng)
+        self.failure_rate = args.failure_rate
+        self.rate_limit_rate = args.rate_limit_rate
+        self.strict_choices = args.strict_choices
+        self.padding = args.page_padding
+        self.forms = {}
+        for i in range(args.forms):
+            form_id = f"mock-form-{i}"
+            data = generate_form(form_id, args.questions, args.pages, args.seed, args.required_rate)
+            self.forms[form_id] = (render_viewform(data, self.padding), form_questions(data))
+        self.stats = {"views": 0, "submissions": 0, "accepted": 0, "rejected": 0, "failed": 0, "rate_limited": 0}
+
+
+def create_app(settings: MockSettings) -> FastAPI:
+    app = FastAPI(title="Mock Google Forms")
+
+    @app.get("/forms")
+    async def list_forms(request: Request):
+        base = str(request.base_url).rstrip("/")
+        return {"forms": [f"{base}/forms/d/e/{form_id}/viewform" for form_id in settings.forms]}
+
+    @app.get("/forms/d/e/{form_id}/viewform")
+    async def viewform(form_id: str):
+        settings.stats["views"] += 1
+        await asyncio.sleep(settings.view_latency())
+        if form_id not in settings.forms:
+            return HTMLResponse("<html><body>Sorry, the file you have requested does not exist.</body></html>", status_code=404)
+        return HTMLResponse(settings.forms[form_id][0])
+
+    @app.post("/forms/d/e/{form_id}/formResponse")
+    async def form_response(form_id: str, request: Request):
+        settings.stats["submissions"] += 1
+        await asyncio.sleep(settings.submit_latency())
+        if form_id not in settings.forms:
+            return HTMLResponse("Not found", status_code=404)
+
+        roll = settings.rng.random()
+        if roll < settings.rate_limit_rate:
+            settings.stats["rate_limited"] += 1
+            return HTMLResponse("Too many requests", status_code=429, headers={"Retry-After": "1"})
+        if roll < settings.rate_limit_rate + settings.failure_rate:
+            settings.stats["failed"] += 1
+            return HTMLResponse("Server error (injected)", status_code=500)
+
+        answers = {}
+        for key, value in parse_qsl((await request.body()).decode("utf-8"), keep_blank_values=True):
+            answers.setdefault(key, []).append(value)
+
+        problems = []
+        for entry_id, (required, options) in settings.forms[form_id][1].items():
+            values = [v for v in answers.get(entry_id, []) if v.strip()]
+            if required and not values:
+                problems.append(f"{entry_id}: this is a required question")
+            elif settings.strict_choices and options and any(v not in options for v in values):
+                problems.append(f"{entry_id}: answer is not one of the options")
+        if problems:
+            settings.stats["rejected"] += 1
+            return HTMLResponse("<html><body>" + "<br>".join(problems) + "</body></html>", status_code=400)
+
+        settings.stats["accepted"] += 1
+        return HTMLResponse("<html><body>Your response has been recorded.</body></html>")
+
+    @app.get("/stats")
+    async def stats():
+        return settings.stats
+
+    return app
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8200)
+    arg_parser.add_argument("--forms", type=int, default=5)
+    arg_parser.add_argument("--questions", type=int, default=12)
+    arg_parser.add_argument("--pages", type=int, default=1)
+    arg_parser.add_argument("--required-rate", type=float, default=0.3, help="fraction of questions marked required")
+    arg_parser.add_argument("--page-padding", type=int, default=200_000, help="bytes of filler script per viewform page")
+    arg_parser.add_argument("--view-latency", default="fixed:0", help="see benchmarks.latency for the spec format")
+    arg_parser.add_argument("--submit-latency", default="fixed:0")
+    arg_parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of submissions answered with 500")
+    arg_parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of submissions answered with 429")
+    arg_parser.add_argument("--strict-choices", action="store_true")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(create_app(MockSettings(args)), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
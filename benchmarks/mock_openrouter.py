@@ -0,0 +1,236 @@
+"""Local OpenRouter-compatible chat-completions server for load and latency tests.
+
+Run from the repository root:
+
+    python -m benchmarks.mock_openrouter --port 8100 --latency lognormal:0.8,0.5 --error-rate 0.02 --rate-limit-rate 0.05
+
+then point the backend at it (any API key is accepted):
+
+    OPENROUTER_API_BASE=http://127.0.0.1:8100/api/v1 OPENROUTER_API_KEY=mock uvicorn backend.main:app
+
+Serves POST /api/v1/chat/completions (plain and "stream": true) and
+GET /api/v1/models. Resume-extraction, field-mapping and form-analysis prompts
+get canned JSON answers derived from the prompt; anything else gets a short
+acknowledgement. GET /stats reports how many requests were served, failed
+and rate limited.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from benchmarks.latency import parse_latency
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+
+# Keywords used to answer field-mapping prompts from the resume data in them
+LABEL_KEYS = (
+    (("email", "e-mail"), "Email"),
+    (("phone", "mobile", "contact number"), "Phone Number"),
+    (("name",), "Full Name"),
+    (("address", "location", "city"), "Address"),
+    (("education", "degree", "university", "college"), "Education"),
+    (("experience", "employment", "work"), "Work Experience"),
+    (("skill",), "Skills"),
+)
+
+ANALYZER_CATEGORIES = {
+    "Email": "email", "Phone Number": "phone", "Full Name": "name", "Address": "address",
+    "Education": "education", "Work Experience": "experience", "Skills": "skills",
+}
+
+
+def _between(text: str, start: str, end: str) -> str:
+    head, found, tail = text.partition(start)
+    return tail.partition(end)[0] if found else ""
+
+
+def _resume_key(label: str) -> str:
+    label = label.lower()
+    for keywords, key in LABEL_KEYS:
+        if any(k in label for k in keywords):
+            return key
+    return None
+
+
+def _resume_answer(prompt: str) -> str:
+    resume_text = prompt.partition("Resume text:")[2]
+    email = EMAIL_PATTERN.search(resume_text)
+    lines = [line.strip() for line in resume_text.splitlines() if line.strip()]
+    return json.dumps({
+        "Full Name": lines[0] if lines else "Mock Candidate",
+        "Email": email.group(0) if email else "mock.candidate@example.com",
+        "Phone Number": "+1 555 010 0000",
+        "Address": "1 Mock Street, Springfield",
+        "Education": "BSc Computer Science, Mock University",
+        "Work Experience": "Software Engineer at Mock Corp",
+        "Skills": "Python, SQL, Docker",
+    })
+
+
+def _mapping_answer(prompt: str) -> str:
+    try:
+        resume = json.loads(_between(prompt, "Resume Data:", "Form Fields:"))
+        fields = json.loads(_between(prompt, "Form Fields:", "For each form field"))
+    except ValueError:
+        return "[]"
+    mappings = []
+    for index, field in enumerate(fields):
+        label = " ".join(str(field.get(k, "")) for k in ("label", "context", "name"))
+        key = _resume_key(label)
+        value = resume.get(key) if key else None
+        if value:
+            mappings.append({
+                "field_index": index,
+                "field_name": field.get("label") or field.get("context") or field.get("name") or f"Field {index}",
+                "resume_key": key,
+                "value": ", ".join(value) if isinstance(value, list) else value,
+                "confidence": 0.9,
+            })
+    return "```json\n" + json.dumps(mappings, indent=2) + "\n```"
+
+
+def _analyzer_answer(prompt: str) -> str:
+    try:
+        fields = json.loads(_between(prompt, "resume data categories:", "Map each field"))
+    except ValueError:
+        fields = []
+    mappings = {}
+    for field in fields:
+        label = field.get("label") or field.get("name") or ""
+        mappings[label] = ANALYZER_CATEGORIES.get(_resume_key(label), "other")
+    return json.dumps({"mappings": mappings})
+
+
+def canned_answer(prompt: str) -> str:
+    """Pick a response shaped like what the calling service parses"""
+    if "resume information into JSON" in prompt:
+        return _resume_answer(prompt)
+    if "maps form fields to resume data" in prompt:
+        return _mapping_answer(prompt)
+    if "map them to resume data categories" in prompt:
+        return _analyzer_answer(prompt)
+    return "OK"
+
+
+class MockSettings:
+    def __init__(self, latency: str, token_delay: float, error_rate: float, rate_limit_rate: float, retry_after: int, seed: int):
+        self.rng = random.Random(seed)
+        self.sample_latency = parse_latency(latency, self.rng)
+        self.token_delay = token_delay
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.stats = {"requests": 0, "streamed": 0, "errors": 0, "rate_limited": 0}
+
+
+def _error(status: int, message: str, headers: dict = None) -> JSONResponse:
+    return JSONResponse(status_code=status, content={"error": {"code": status, "message": message}}, headers=headers)
+
+
+def _prompt_text(messages: list) -> str:
+    parts = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+        parts.append(content or "")
+    return "\n".join(parts)
+
+
+def create_app(settings: MockSettings) -> FastAPI:
+    app = FastAPI(title="Mock OpenRouter")
+
+    @app.post("/api/v1/chat/completions")
+    async def chat_completions(request: Request):
+        settings.stats["requests"] += 1
+        body = await request.json()
+        await asyncio.sleep(settings.sample_latency())
+
+        roll = settings.rng.random()
+        if roll < settings.rate_limit_rate:
+            settings.stats["rate_limited"] += 1
+            return _error(429, "Rate limit exceeded (injected)", {"Retry-After": str(settings.retry_after)})
+        if roll < settings.rate_limit_rate + settings.error_rate:
+            settings.stats["errors"] += 1
+            return _error(500, "Upstream provider error (injected)")
+
+        answer = canned_answer(_prompt_text(body.get("messages", [])))
+        completion_id = f"gen-{uuid.uuid4().hex[:24]}"
+        model = body.get("model", "mock/model")
+        created = int(time.time())
+
+        if body.get("stream"):
+            settings.stats["streamed"] += 1
+            return StreamingResponse(_stream(completion_id, model, created, answer, settings.token_delay), media_type="text/event-stream")
+
+        prompt_tokens = len(_prompt_text(body.get("messages", []))) // 4
+        completion_tokens = len(answer) // 4
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": answer}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    @app.get("/api/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "mistralai/mistral-7b-instruct:free", "object": "model", "created": 0, "owned_by": "mock"}]}
+
+    @app.get("/stats")
+    async def stats():
+        return settings.stats
+
+    return app
+
+
+async def _stream(completion_id: str, model: str, created: int, answer: str, token_delay: float):
+    def chunk(delta: dict, finish_reason=None) -> str:
+        data = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(data)}\n\n"
+
+    yield chunk({"role": "assistant", "content": ""})
+    # Roughly word-sized tokens, keeping the whitespace attached
+    for token in re.findall(r"\S+\s*|\s+", answer):
+        if token_delay:
+            await asyncio.sleep(token_delay)
+        yield chunk({"content": token})
+    yield chunk({}, "stop")
+    yield "data: [DONE]\n\n"
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8100)
+    arg_parser.add_argument("--latency", default="fixed:0", help="see benchmarks.latency for the spec format")
+    arg_parser.add_argument("--token-delay", type=float, default=0.0, help="seconds between streamed tokens")
+    arg_parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    arg_parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    arg_parser.add_argument("--retry-after", type=int, default=1)
+    arg_parser.add_argument("--seed", type=int, default=None)
+    args = arg_parser.parse_args()
+
+    import uvicorn
+    settings = MockSettings(args.latency, args.token_delay, args.error_rate, args.rate_limit_rate, args.retry_after, args.seed)
+    uvicorn.run(create_app(settings), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""Per-stage latency and throughput of the resume extraction pipeline.
+
+Run from the repository root:
+
+    python -m benchmarks.pipeline --output pipeline.json
+    python -m benchmarks.pipeline --output new.json --compare pipeline.json
+
+Times _extract_text, _extract_pdf_text_with_ocr, _extract_docx_text and
+_extract_basic_fields on the generated corpus (see benchmarks.corpus), plus
+end-to-end extract_data with LlamaParse disabled and the LLM replaced by a
+stub. Results are written as JSON; --compare exits non-zero when a stage's
+p50 is more than --max-regression times the baseline's.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from backend.logger import logger
+from backend.services.resume_parser import ResumeParser, load_ocr
+from benchmarks.corpus import generate_corpus
+
+CANNED_LLM_RESPONSE = json.dumps({
+    "Full Name": "Stub User",
+    "Email": "stub@example.com",
+    "Phone Number": "+1 555 000 0000",
+    "Address": "",
+    "Education": "BSc Computer Science",
+    "Work Experience": "Engineer at Stub Corp",
+    "Skills": "Python, SQL",
+})
+
+
+class StubLLM:
+    """Stands in for the OpenRouter client with a fixed response and delay"""
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def acomplete(self, prompt: str) -> str:
+        await asyncio.sleep(self.latency)
+        return CANNED_LLM_RESPONSE
+
+
+def ocr_ready() -> bool:
+    # pdf2image and pytesseract also need the poppler and tesseract binaries
+    return bool(load_ocr()) and bool(shutil.which("pdftoppm")) and bool(shutil.which("tesseract"))
+
+
+def summarize(stage: str, kind: str, size: str, latencies: list, total_bytes: int) -> dict:
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        "stage": stage,
+        "kind": kind,
+        "size": size,
+        "calls": len(latencies),
+        "mean_ms": round(total / len(latencies) * 1000, 3),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "docs_per_s": round(len(latencies) / total, 1) if total else None,
+        "mb_per_s": round(total_bytes / total / 1e6, 2) if total else None,
+    }
+
+
+def time_calls(fn, repeat: int) -> list:
+    fn()  # warm-up
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def time_async_calls(fn, repeat: int) -> list:
+    await fn()
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def run(parser: ResumeParser, documents: list, repeat: int, include_ocr: bool) -> tuple:
+    groups = {}
+    skipped = []
+
+    def record(stage, document, latencies):
+        entry = groups.setdefault((stage, document.kind, document.size), ([], [0]))
+        entry[0].extend(latencies)
+        entry[1][0] += len(document.content) * len(latencies)
+
+    for document in documents:
+        content, filename = document.content, document.filename
+        record("extract_text", document, time_calls(lambda: parser._extract_text(content, filename), repeat))
+
+        if document.kind == "docx":
+            record("docx_text", document, time_calls(lambda: parser._extract_docx_text(content), repeat))
+        if document.kind == "scanned_pdf":
+            if include_ocr:
+                record("ocr", document, time_calls(lambda: parser._extract_pdf_text_with_ocr(content), repeat))
+            elif "ocr" not in skipped:
+                skipped.append("ocr")
+
+        text = parser._extract_text(content, filename)
+        if text.strip():
+            record("basic_fields", document, time_calls(lambda: parser._extract_basic_fields(text), repeat))
+
+        latencies = asyncio.run(time_async_calls(lambda: parser.extract_data(content, filename), repeat))
+        record("extract_data", document, latencies)
+
+    results = [summarize(stage, kind, size, latencies, total_bytes[0])
+               for (stage, kind, size), (latencies, total_bytes) in groups.items()]
+    return results, skipped
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list, baseline_path: str, max_regression: float) -> int:
+    with open(baseline_path) as f:
+        baseline = {(r["stage"], r["kind"], r["size"]): r for r in json.load(f)["results"]}
+
+    regressions = 0
+    for result in results:
+        before = baseline.get((result["stage"], result["kind"], result["size"]))
+        if not before or not before["p50_ms"]:
+            continue
+        ratio = result["p50_ms"] / before["p50_ms"]
+        flag = ""
+        if ratio > max_regression:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{result['stage']:14} {result['kind']:12} {result['size']:7} "
+              f"{before['p50_ms']:9.3f} -> {result['p50_ms']:9.3f} ms  x{ratio:5.2f}{flag}")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--output", default="pipeline-benchmark.json")
+    arg_parser.add_argument("--compare", help="baseline results file to diff against")
+    arg_parser.add_argument("--max-regression", type=float, default=1.5)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--per-size", type=int, default=2)
+    arg_parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds the stub LLM waits per call")
+    args = arg_parser.parse_args()
+
+    # The expected fallbacks (no LlamaParse, no OCR) log an error on every call;
+    # keep that I/O out of the timings
+    logger.setLevel(logging.CRITICAL)
+
+    parser = ResumeParser()
+    parser.parser = None
+    parser.llm = StubLLM(args.llm_latency)
+
+    documents = generate_corpus(args.seed, args.per_size)
+    include_ocr = ocr_ready()
+    results, skipped = run(parser, documents, args.repeat, include_ocr)
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"seed": args.seed, "per_size": args.per_size, "repeat": args.repeat, "llm_latency": args.llm_latency},
+        "skipped_stages": skipped,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for r in results:
+        print(f"{r['stage']:14} {r['kind']:12} {r['size']:7} p50 {r['p50_ms']:9.3f} ms  p95 {r['p95_ms']:9.3f} ms  {r['docs_per_s'] or 0:9.1f} docs/s")
+    if skipped:
+        print(f"skipped (OCR dependencies missing): {', '.join(skipped)}")
+    print(f"wrote {args.output}")
+
+    if args.compare:
+        return compare(results, args.compare, args.max_regression)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Serialization cost and memory per resume profile.
+
+Run from the repository root:
+
+    python -m benchmarks.serialization
+
+Compares the loose dict + json.dumps path the services used before
+ResumeProfile with the slotted model and models.dumps (orjson when installed).
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from backend.models import ORJSON_AVAILABLE, ResumeProfile, dumps
+
+
+def sample_profile(raw_chars: int) -> dict:
+    return {
+        "Full Name": "Alice Example",
+        "Email": "alice@example.com",
+        "Phone Number": "+1 (555) 123-4567",
+        "Address": "1 Main St, Springfield",
+        "Education": ["BSc Computer Science, MIT, 2015", "MSc Data Science, Stanford, 2017"],
+        "Work Experience": [f"Engineer at Company {i}, 201{i}-201{i + 1}" for i in range(8)],
+        "Skills": ["Python", "SQL", "Go", "Kubernetes", "React", "AWS"] * 3,
+        "raw_text": ("lorem ipsum dolor sit amet " * (raw_chars // 27 + 1))[:raw_chars],
+    }
+
+
+def per_call(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def memory_per_item(make, count: int) -> float:
+    tracemalloc.start()
+    items = [make() for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return size / count
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--iterations", type=int, default=2000)
+    arg_parser.add_argument("--raw-chars", type=int, default=20000)
+    args = arg_parser.parse_args()
+
+    data = sample_profile(args.raw_chars)
+    profile = ResumeProfile.from_dict(data)
+
+    print(f"orjson available: {ORJSON_AVAILABLE}")
+    print(f"normalize (from_dict)       {per_call(lambda: ResumeProfile.from_dict(data), args.iterations):8.1f} us")
+    print(f"json.dumps(dict)            {per_call(lambda: json.dumps(data), args.iterations):8.1f} us")
+    print(f"dumps(to_dict())            {per_call(lambda: dumps(profile.to_dict()), args.iterations):8.1f} us")
+    print(f"dumps(to_dict(no raw_text)) {per_call(lambda: dumps(profile.to_dict(include_raw=False)), args.iterations):8.1f} us")
+
+    # Structure only: raw_text is shared so both sides count just the containers
+    print(f"memory per dict profile     {memory_per_item(lambda: dict(data, Education=list(data['Education']), Skills=list(data['Skills']), **{'Work Experience': list(data['Work Experience'])}), 1000):8.0f} B")
+    print(f"memory per ResumeProfile    {memory_per_item(lambda: ResumeProfile.from_dict(data), 1000):8.0f} B")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
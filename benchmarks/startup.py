@@ -0,0 +1,91 @@
+"""Cold-start latency: time from launching the server to its first healthy response.
+
+Run from the repository root:
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --runs 5 --eager
+
+Each run starts `uvicorn backend.main:app` in a new process and polls
+/api/health until it answers 200. --eager imports EAGER_IMPORTS before the
+app, the way backend.main used to at startup, for a before/after comparison
+(modules that are not installed are skipped and listed).
+"""
+import argparse
+import importlib.util
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+EAGER_IMPORTS = ("selenium.webdriver", "bs4", "llama_index.llms.openrouter", "llama_parse", "pdf2image", "pytesseract")
+
+
+def installed(module: str) -> bool:
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ModuleNotFoundError:
+        return False
+
+
+def start_server(port: int, eager: tuple, data_dir: str):
+    # A fresh job queue and outbox each run, kept out of the working tree
+    env = dict(os.environ, JOBS_DB_PATH=os.path.join(data_dir, "jobs.db"), OUTBOX_DB_PATH=os.path.join(data_dir, "outbox.db"))
+    code = "".join(f"import {module}\n" for module in eager)
+    code += f"import uvicorn\nuvicorn.run('backend.main:app', port={port}, log_level='warning')\n"
+    return subprocess.Popen([sys.executable, "-c", code], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def time_to_healthy(port: int, eager: tuple, timeout: float) -> float:
+    data_dir = tempfile.mkdtemp(prefix="startup-bench-")
+    started = time.perf_counter()
+    server = start_server(port, eager, data_dir)
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1) as client:
+            while time.perf_counter() - started < timeout:
+                if server.poll() is not None:
+                    raise SystemExit(f"Server exited with status {server.returncode}")
+                try:
+                    if client.get("/api/health").status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.HTTPError:
+                    pass
+                time.sleep(0.01)
+        raise SystemExit("Server did not become healthy")
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--runs", type=int, default=5)
+    arg_parser.add_argument("--port", type=int, default=8300)
+    arg_parser.add_argument("--eager", action="store_true", help="import the heavy dependencies first, as before")
+    arg_parser.add_argument("--timeout", type=float, default=60)
+    args = arg_parser.parse_args()
+
+    eager = ()
+    if args.eager:
+        eager = tuple(m for m in EAGER_IMPORTS if installed(m))
+        missing = [m for m in EAGER_IMPORTS if m not in eager]
+        if missing:
+            print(f"Not installed, skipped: {', '.join(missing)}")
+
+    samples = []
+    for run in range(args.runs):
+        samples.append(time_to_healthy(args.port, eager, args.timeout))
+        print(f"run {run + 1}: {samples[-1] * 1000:.0f} ms")
+    print(f"\n{'eager' if args.eager else 'lazy'} start to healthy: median {statistics.median(samples) * 1000:.0f} ms, "
+          f"min {min(samples) * 1000:.0f} ms, max {max(samples) * 1000:.0f} ms over {len(samples)} run(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Disk bytes written per LlamaParse request, before and after uploads stopped going through temp files.
+
+Run from the repository root (Linux: reads /proc/self/io):
+
+    python -m benchmarks.upload_disk_io
+
+For each document in the generated corpus (see benchmarks.corpus), runs
+ResumeParser._try_llama_cloud with a stand-in LlamaParse client and a stub
+LLM, and the way it used to work: copy the upload to a NamedTemporaryFile and
+hand LlamaParse the path. Reports bytes written (wchar) and temp files created
+per request for each path. Fails (non-zero exit) if the current path writes
+anything to disk.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from backend.logger import logger
+from backend.services.resume_parser import ResumeParser
+from benchmarks.corpus import generate_corpus
+from benchmarks.pipeline import StubLLM
+
+
+class StubDocument:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubLlamaParse:
+    """Accepts bytes or a path, like LlamaParse.aload_data, and returns fixed text"""
+
+    async def aload_data(self, file, extra_info=None):
+        if isinstance(file, str):
+            with open(file, "rb") as f:
+                f.read()
+        return [StubDocument("Stub User\nstub@example.com\nSkills\nPython")]
+
+
+def bytes_written() -> int:
+    with open("/proc/self/io") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("wchar:"))
+
+
+async def legacy_load(parser: ResumeParser, content: bytes, filename: str):
+    """What _try_llama_cloud did before: a temp file per upload"""
+    with tempfile.NamedTemporaryFile(suffix=f".{filename.split('.')[-1]}", delete=False) as tmp_file:
+        tmp_file.write(content)
+        tmp_file_path = tmp_file.name
+    try:
+        documents = await parser.parser.aload_data(tmp_file_path)
+        return await parser._parse_with_ai('\n'.join(doc.text for doc in documents))
+    finally:
+        os.unlink(tmp_file_path)
+
+
+async def measure(load, documents: list, repeat: int) -> dict:
+    written = requests = 0
+    created = []
+    # Both paths clean up, so count temp files as they are created
+    original = tempfile.NamedTemporaryFile
+
+    def counting(*args, **kwargs):
+        created.append(1)
+        return original(*args, **kwargs)
+
+    tempfile.NamedTemporaryFile = counting
+    started = time.perf_counter()
+    try:
+        for document in documents:
+            for _ in range(repeat):
+                before = bytes_written()
+                await load(document.content, document.filename)
+                written += bytes_written() - before
+                requests += 1
+    finally:
+        tempfile.NamedTemporaryFile = original
+    return {
+        "requests": requests,
+        "bytes_per_request": written / requests,
+        "temp_files_per_request": len(created) / requests,
+        "ms_per_request": (time.perf_counter() - started) / requests * 1000,
+    }
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--per-size", type=int, default=2)
+    args = arg_parser.parse_args()
+    if not os.path.exists("/proc/self/io"):
+        raise SystemExit("Needs /proc/self/io (Linux)")
+
+    # Keep log writes out of the byte counts
+    logger.setLevel(logging.CRITICAL)
+
+    parser = ResumeParser()
+    parser.parser = StubLlamaParse()
+    parser.llm = StubLLM(0.0)
+    documents = [d for d in generate_corpus(args.seed, args.per_size) if d.kind != "txt"]
+
+    results = {
+        "temp file (before)": asyncio.run(measure(lambda c, f: legacy_load(parser, c, f), documents, args.repeat)),
+        "in memory (now)": asyncio.run(measure(parser._try_llama_cloud, documents, args.repeat)),
+    }
+    for name, r in results.items():
+        print(f"{name:20} {r['requests']:5} req  {r['bytes_per_request'] / 1024:10.1f} KiB written/req  "
+              f"{r['temp_files_per_request']:4.1f} temp files/req  {r['ms_per_request']:7.2f} ms/req")
+    return 1 if results["in memory (now)"]["bytes_per_request"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
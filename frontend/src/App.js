@@ -3,13 +3,24 @@ import { Container, Row, Col, Card, Button, Spinner } from 'react-bootstrap';
 import FileUpload from './components/FileUpload';
 import FormInput from './components/FormInput';
 import ResultDisplay from './components/ResultDisplay';
-import { fillForm } from './services/api';
+import { fillFormStream } from './services/api';
+
+const STAGE_LABELS = {
+  parsed: 'Checking ATS readiness...',
+  ats: 'Fetching form...',
+  form_schema: 'Mapping fields...',
+  mapped: 'Submitting...',
+  submitted: 'Finishing up...',
+};
 
 function App() {
   const [file, setFile] = useState(null);
   const [formUrl, setFormUrl] = useState('');
   const [result, setResult] = useState(null);
   const [loading, setLoading] = useState(false);
+  const [stage, setStage] = useState('');
+  // Partial results from the stream, shown until the final result arrives
+  const [progress, setProgress] = useState({});
 
   // Load previous form URL from localStorage on component mount
   useEffect(() => {
@@ -34,11 +45,17 @@ function App() {
     }
 
     setLoading(true);
+    setStage('Parsing resume...');
+    setResult(null);
+    setProgress({});
     try {
-      const response = await fillForm(file, formUrl);
-      console.log('API Response:', response.data);
-      // Backend now returns result directly
-      setResult(response.data);
+      const data = await fillFormStream(file, formUrl, (event, payload) => {
+        if (STAGE_LABELS[event]) setStage(STAGE_LABELS[event]);
+        if (event === 'parsed') setProgress((p) => ({ ...p, profile: payload.data }));
+        if (event === 'mapped') setProgress((p) => ({ ...p, filledFields: payload.filled_fields }));
+      });
+      console.log('API Response:', data);
+      setResult(data);
     } catch (error) {
       console.error('API Error:', error);
       setResult({ success: false, error: error.message });
@@ -84,7 +101,7 @@ function App() {
                   {loading ? (
                     <>
                       <Spinner animation="border" size="sm" className="me-2" />
-                      Processing...
+                      {stage || 'Processing...'}
                     </>
                   ) : (
                     '🚀 Submit Form Directly'
@@ -94,9 +111,9 @@ function App() {
             </Card.Body>
           </Card>
           
-          {result && (
+          {(result || (loading && (progress.profile || progress.filledFields))) && (
             <div className="mt-4">
-              <ResultDisplay result={result} />
+              <ResultDisplay result={result} progress={progress} />
             </div>
           )}
         </Col>
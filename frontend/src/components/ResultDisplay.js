@@ -1,8 +1,53 @@
 import React from 'react';
 import { Alert, ListGroup, Badge } from 'react-bootstrap';
 
-const ResultDisplay = ({ result }) => {
-  if (!result) return null;
+const formatValue = (value) => (Array.isArray(value) ? value.join(', ') : value);
+
+// What the stream has delivered so far: the parsed profile, then the mapped fields
+const PartialResult = ({ progress }) => (
+  <Alert variant="info" className="shadow-sm">
+    <Alert.Heading className="h5">
+      <i className="bi bi-hourglass-split me-2"></i>
+      Filling the form...
+    </Alert.Heading>
+    {progress.profile && (
+      <div className="mt-3">
+        <p className="mb-2 fw-semibold">Parsed from your resume:</p>
+        <ListGroup variant="flush">
+          {Object.entries(progress.profile)
+            .filter(([, value]) => value && value.length > 0)
+            .map(([name, value]) => (
+              <ListGroup.Item key={name} className="px-0 py-1 bg-transparent">
+                <strong className="me-2">{name}:</strong>
+                {formatValue(value)}
+              </ListGroup.Item>
+            ))}
+        </ListGroup>
+      </div>
+    )}
+    {progress.filledFields && progress.filledFields.length > 0 && (
+      <div className="mt-3">
+        <p className="mb-2">
+          <Badge bg="info" className="me-2">{progress.filledFields.length}</Badge>
+          fields mapped, submitting...
+        </p>
+        <ListGroup variant="flush">
+          {progress.filledFields.map((field, index) => (
+            <ListGroup.Item key={index} className="px-0 py-1 bg-transparent">
+              <i className="bi bi-arrow-right-short me-2"></i>
+              {field}
+            </ListGroup.Item>
+          ))}
+        </ListGroup>
+      </div>
+    )}
+  </Alert>
+);
+
+const ResultDisplay = ({ result, progress }) => {
+  if (!result) {
+    return progress ? <PartialResult progress={progress} /> : null;
+  }
 
   console.log('Result Display Data:', result);
 
@@ -41,4 +41,51 @@ export const fillForm = async (file, formUrl) => {
 
 export const healthCheck = async () => {
   return api.get('/health');
-};
\ No newline at end of file
+};
+
+// Streams fill-form progress as server-sent events. onEvent(event, data) is
+// called for each stage; resolves with the final "done" payload.
+export const fillFormStream = async (file, formUrl, onEvent) => {
+  const formData = new FormData();
+  formData.append('file', file);
+  formData.append('form_url', formUrl);
+
+  const response = await fetch(`${API_BASE_URL}/fill-form/stream`, {
+    method: 'POST',
+    body: formData,
+  });
+  if (!response.ok) {
+    const body = await response.json().catch(() => ({}));
+    throw new Error(body.error || body.detail || `Request failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const message = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let event = 'message';
+      const dataLines = [];
+      message.split('\n').forEach((line) => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+      });
+      // Comment-only messages are keep-alives
+      if (!dataLines.length) continue;
+
+      const data = JSON.parse(dataLines.join('\n'));
+      if (event === 'error') throw new Error(data.error || 'Form filling failed');
+      if (onEvent) onEvent(event, data);
+      if (event === 'done') return data;
+    }
+  }
+  throw new Error('Stream ended before the form was submitted');
+};